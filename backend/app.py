@@ -1,15 +1,34 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from faster_whisper import WhisperModel
-import tempfile, requests, json
+from fastapi.responses import ORJSONResponse
+from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
+import orjson
+import httpx
+import numpy as np
 import re
-from typing import Dict, List, Optional, Tuple
-from pydantic import BaseModel
-from datetime import datetime, timedelta
+import random
+from typing import Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel, PrivateAttr
+from datetime import datetime, timedelta, timezone
 import asyncio
 from enum import Enum
+from dataclasses import dataclass
+from collections import Counter, deque
+from itertools import islice, zip_longest
+import time
+import uuid
+from cachetools import TTLCache
 
-app = FastAPI()
+from utils.cleaning import ResponseCleaner
+from utils.locks import KeyedLocks
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,17 +41,63 @@ app.add_middleware(
 # ------------------------------------------------------
 # Load Whisper (GPU STT)
 # ------------------------------------------------------
+# int8 weights with fp16 activations: roughly half the VRAM of float16 on Ampere+.
+# CTranslate2 quantizes float16 checkpoints on load; use "int8" on Turing cards.
 whisper_model = WhisperModel(
     "../models/medium",
     device="cuda",
-    compute_type="float16"
+    compute_type="int8_float16"
 )
 
+# Batch VAD-segmented chunks onto the GPU instead of decoding them one by one.
+# Keep the batch modest so the LLM sharing the GPU still has VRAM headroom.
+WHISPER_BATCH_SIZE = 8
+batched_model = BatchedInferencePipeline(model=whisper_model)
+
 # ------------------------------------------------------
 # LLM Server URL (DeepSeek/LLaMA CPP)
 # ------------------------------------------------------
+# Serve a Q4_K_M GGUF fully offloaded, with a q8_0 KV cache and enough slots
+# for the concurrent analyzer/interviewer calls to batch together:
+#   llama-server -m <model>-Q4_K_M.gguf --port 9000 -ngl 99 --flash-attn \
+#       --cache-type-k q8_0 --cache-type-v q8_0 --parallel 4
 LLM_URL = "http://localhost:9000/completion"
 
+# Shared keep-alive async client: LLM calls never block the event loop, and
+# analysis and question generation can overlap
+# Sized for many concurrent sessions, not just one interview's pair of calls
+llm_async_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=httpx.Timeout(15.0)
+)
+
+@app.on_event("startup")
+async def warm_up_models():
+    """Pay CUDA/kernel init and LLM connect costs before the first real request"""
+    try:
+        # One second of silence at 16kHz through the batched pipeline that serves
+        # requests; segments decode lazily, so list() makes the pass actually run
+        def _warm_whisper():
+            segments, _ = batched_model.transcribe(
+                np.zeros(16000, dtype=np.float32),
+                batch_size=WHISPER_BATCH_SIZE
+            )
+            list(segments)
+        
+        await asyncio.to_thread(_warm_whisper)
+    except Exception as e:
+        print(f"Whisper warm-up failed: {e}")
+    
+    try:
+        await llm_async_client.post(LLM_URL, json={"prompt": "hi", "n_predict": 1}, timeout=5)
+    except Exception as e:
+        print(f"LLM warm-up failed: {e}")
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm_async_client.aclose()
+    assessment_cache.save()
+
 # ------------------------------------------------------
 # Enhanced Interview State Management
 # ------------------------------------------------------
@@ -56,6 +121,23 @@ class CandidateProfile(BaseModel):
     confidence_level: int = 3  # 1-5 scale
     problem_solving_ability: Optional[int] = None
     depth_of_knowledge: Dict[str, int] = {}  # technology -> score 1-10
+    # Membership indexes for O(1) dedup; not part of the serialized profile
+    _skills_set: Set[str] = PrivateAttr(default_factory=set)
+    _tech_set: Set[str] = PrivateAttr(default_factory=set)
+    # Joined strings for prompts/reports, keyed by (field, limit); cleared on mutation
+    _csv_cache: Dict[Tuple[str, Optional[int]], str] = PrivateAttr(default_factory=dict)
+    
+    def csv(self, field: str, limit: Optional[int] = None) -> str:
+        """Comma-joined skills/technologies (first `limit` entries), built once per change"""
+        key = (field, limit)
+        joined = self._csv_cache.get(key)
+        if joined is None:
+            joined = self._csv_cache[key] = ", ".join(getattr(self, field)[:limit])
+        return joined
+    
+    def invalidate(self):
+        """Drop cached joined strings after skills/technologies change"""
+        self._csv_cache.clear()
     
 class AnswerAnalysis(BaseModel):
     quality_score: int  # 1-10
@@ -69,14 +151,36 @@ class AnswerAnalysis(BaseModel):
     red_flags: List[str] = []
     positive_signs: List[str] = []
 
+@dataclass(slots=True)
+class AnswerRecord:
+    answer: str
+    analysis: AnswerAnalysis
+    phase: str
+    timestamp: float  # epoch seconds
+
+CONVERSATION_HISTORY_LIMIT = 50
+
 class InterviewState:
+    # Fixed attribute set: smaller instances and faster attribute access
+    __slots__ = (
+        "phase", "job_role", "questions_asked", "answers_received", "candidate_profile",
+        "conversation_history", "total_turns", "current_topic", "difficulty_level",
+        "start_time", "end_time", "phase_start_time", "interview_focus_areas",
+        "red_flags", "positive_signs", "_red_flags_set", "_positive_signs_set",
+        "_phase_question_counts", "_recent_context_lines", "_profile_dump_cache",
+        "phases_covered",
+    )
+    
     def __init__(self):
         self.phase = InterviewPhase.GREETING
         self.job_role = "Software Engineer"
+        # Record timestamps are epoch seconds; rendered to ISO only when returned
         self.questions_asked: List[Dict] = []  # [{question, phase, timestamp}]
-        self.answers_received: List[Dict] = []  # [{answer, analysis, timestamp}]
+        self.answers_received: List[AnswerRecord] = []
         self.candidate_profile = CandidateProfile()
-        self.conversation_history: List[Dict] = []
+        # Only the most recent turns are kept; the report is built from questions/answers
+        self.conversation_history: deque = deque(maxlen=CONVERSATION_HISTORY_LIMIT)
+        self.total_turns = 0
         self.current_topic: Optional[str] = None
         self.difficulty_level: int = 3  # 1-5 scale, adjusts based on performance
         self.start_time = None
@@ -85,17 +189,91 @@ class InterviewState:
         self.interview_focus_areas: List[str] = []
         self.red_flags: List[str] = []
         self.positive_signs: List[str] = []
+        self._red_flags_set: Set[str] = set()
+        self._positive_signs_set: Set[str] = set()
+        self._phase_question_counts: Counter = Counter()
+        # Pre-formatted "Role: content" lines for the most recent turns
+        self._recent_context_lines: deque = deque(maxlen=6)
+        self._profile_dump_cache: Optional[Dict] = None
+        # Phases with at least one answer, maintained as answers arrive
+        self.phases_covered: Set[str] = set()
+    
+    def add_turn(self, turn: Dict):
+        """Append a turn to the conversation history and the rolling context"""
+        self.conversation_history.append(turn)
+        self.total_turns += 1
+        role = "Interviewer" if turn["role"] == "interviewer" else "Candidate"
+        self._recent_context_lines.append(f"{role}: {turn['content'][:100]}")
+        
+    def add_answer(self, record: AnswerRecord):
+        """Record an analyzed answer and note the phase it was given in"""
+        self.answers_received.append(record)
+        self.phases_covered.add(record.phase)
+    
+    def add_question(self, question: str, timestamp: Optional[float] = None):
+        """Record an interviewer question and count it against the current phase"""
+        self.questions_asked.append({
+            "question": question,
+            "phase": self.phase.value,
+            "timestamp": timestamp or time.time()
+        })
+        self._phase_question_counts[self.phase] += 1
+    
+    def profile_dump(self) -> Dict:
+        """Serialized candidate profile, rebuilt only after the profile changes"""
+        if self._profile_dump_cache is None:
+            self._profile_dump_cache = self.candidate_profile.dict()
+        return self._profile_dump_cache
+    
+    def phase_question_count(self) -> int:
+        """Number of questions asked in the current phase"""
+        return self._phase_question_counts[self.phase]
         
     def get_conversation_context(self, num_exchanges: int = 3) -> str:
         """Get recent conversation context for AI"""
-        recent = []
-        for i in range(max(0, len(self.conversation_history) - num_exchanges), len(self.conversation_history)):
-            if i >= 0:
-                recent.append(self.conversation_history[i])
-        return json.dumps(recent, indent=2)
-
-# Global interview state
-interview_state = InterviewState()
+        lines = self._recent_context_lines
+        return "\n".join(islice(lines, max(0, len(lines) - num_exchanges), None))
+
+# Per-session interview state; idle sessions expire so memory stays bounded
+SESSION_TTL_SECONDS = 3600
+
+class SessionStore:
+    """Interview sessions keyed by id, with a lock per session"""
+    
+    def __init__(self, maxsize: int = 1000, ttl: int = SESSION_TTL_SECONDS):
+        self._states: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._locks = KeyedLocks()
+    
+    def create(self) -> Tuple[str, InterviewState]:
+        """Start a fresh session under a new random id"""
+        session_id = uuid.uuid4().hex
+        state = InterviewState()
+        self._states[session_id] = state
+        return session_id, state
+    
+    def get(self, session_id: str) -> InterviewState:
+        """Look up a session, refreshing its expiry"""
+        state = self._states.get(session_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Interview session not found or expired")
+        # Re-insert so active interviews are not evicted mid-session
+        self._states[session_id] = state
+        return state
+    
+    def pop(self, session_id: str) -> Optional[InterviewState]:
+        """Forget a session"""
+        return self._states.pop(session_id, None)
+    
+    def lock(self, session_id: str) -> asyncio.Lock:
+        """Lock serializing requests for one session"""
+        return self._locks.get(session_id)
+
+sessions = SessionStore()
+
+async def session_state(session_id: str = Header(..., alias="X-Session-ID")):
+    """Dependency yielding the caller's session; overlapping requests for it wait their turn"""
+    async with sessions.lock(session_id):
+        yield sessions.get(session_id)
 
 # ------------------------------------------------------
 # Interview Configuration
@@ -134,73 +312,102 @@ PHASE_CONFIG = {
 }
 
 # ------------------------------------------------------
-# Enhanced Helper Functions
+# Static Prompt Prefixes
 # ------------------------------------------------------
-def clean_llm_response(text: str) -> str:
-    """Clean LLM response for interview conversation"""
-    # Remove thinking tags
-    cleaned = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL | re.IGNORECASE)
-    cleaned = re.sub(r'<thought>.*?</thought>', '', cleaned, flags=re.DOTALL | re.IGNORECASE)
-    
-    # Remove meta commentary and stage directions
-    meta_patterns = [
-        r'^.*?(?=(Hello|Hi|Good|Thank|So|Now|Next|Alright|Well|Can you|Could you|What|How|Why|Tell me|Describe|Would you))',
-        r'^(Wait,|Hmm,|Let me see,|Let me think,|I need to|Looking at|The candidate)',
-        r'\(.*?\)',  # Remove parenthetical comments
-        r'\[.*?\]',  # Remove bracketed comments
-    ]
-    
-    for pattern in meta_patterns:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.MULTILINE)
-    
-    # Detect if AI is trying to answer a question instead of asking one
-    answer_indicators = [
-        "you should", "i recommend", "it's important to", "the best time",
-        "generally speaking", "in my experience", "typically",
-        "it depends on", "you'll want to", "you need to"
-    ]
-    
-    cleaned_lower = cleaned.lower()
-    if any(indicator in cleaned_lower for indicator in answer_indicators):
-        # AI is trying to give advice instead of asking a question
-        # Return empty to trigger fallback
-        return ""
-    
-    # Remove excess whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    cleaned = re.sub(r'\n+', '\n', cleaned)
-    
-    # Extract only the interviewer's speech (not actions or thoughts)
-    lines = cleaned.split('\n')
-    speech_lines = []
-    for line in lines:
-        # Keep lines that sound like speech, not stage directions
-        if line and not line.startswith(('(', '[', '*')) and len(line) > 10:
-            speech_lines.append(line.strip())
-    
-    result = ' '.join(speech_lines[:2])  # Limit to 1-2 sentences
-    
-    # If result is too short or seems incomplete, return empty to trigger fallback
-    if len(result.split()) < 3:
-        return ""
-    
-    return result.strip()
+# These must stay byte-identical across candidates and turns (no interpolation)
+# so llama.cpp can reuse the cached KV state and only prefill the dynamic suffix.
+# Interviewer and analyzer are pinned to separate slots so each slot keeps its own
+# prefix resident; this needs --parallel 2 or more (see the server command above).
+INTERVIEWER_SLOT = 0
+ANALYZER_SLOT = 1
 
-def analyze_candidate_answer(question: str, answer: str, phase: InterviewPhase) -> AnswerAnalysis:
-    """Use AI to deeply analyze the candidate's answer"""
-    
-    prompt = f"""
-You are Alex, an expert interviewer analyzing a candidate's response.
+STATIC_INTERVIEWER_PREFIX = """You are Alex, a professional job interviewer. Your ONLY job is to ask interview questions.
 
-JOB ROLE: {interview_state.job_role}
-CURRENT PHASE: {phase.value}
-CURRENT TOPIC: {interview_state.current_topic or 'General'}
+CRITICAL RULES:
+1. You are the INTERVIEWER, not the candidate
+2. You ASK questions, you do NOT answer questions
+3. If the candidate asks you a question, politely redirect and ask your own question
+4. Never provide career advice, job search tips, or answer "when should I..." questions
+5. Stay focused on evaluating the candidate for the job role given below
 
-QUESTION ASKED: "{question}"
+PHASE GUIDE:
 
-CANDIDATE'S ANSWER: "{answer}"
+GREETING:
+- Greet the candidate warmly
+- Introduce yourself as Alex, the interviewer
+- Ask them to introduce themselves and their background
+- Keep it brief (1-2 sentences)
+Example: "Hello! I'm Alex, and I'll be interviewing you today. Could you please tell me about yourself?"
+
+INTRODUCTION:
+- Ask about their background, experience, or motivation
+- Focus on understanding their career journey
+- Ask ONE clear question
+Examples:
+- "What drew you to apply for this role?"
+- "Can you walk me through your relevant work experience?"
+- "What are you looking for in your next position?"
 
-Analyze this answer thoroughly and provide:
+TECHNICAL:
+- Ask a technical question relevant to the job role, building on technologies they mentioned
+- Test their knowledge and problem-solving ability
+- Ask ONE specific technical question
+Examples:
+- "Can you explain how you would approach debugging a performance issue?"
+- "Describe your experience with database optimization."
+- "How do you ensure code quality in your projects?"
+
+BEHAVIORAL:
+- Ask about past experiences, teamwork, or challenges
+- Use behavioral interview techniques (STAR method)
+- Ask ONE behavioral question
+Examples:
+- "Tell me about a time you faced a difficult deadline. How did you handle it?"
+- "Describe a situation where you had to resolve a conflict with a teammate."
+- "What's your approach to receiving critical feedback?"
+
+SITUATIONAL:
+- Present a hypothetical scenario related to the job role
+- Ask how they would handle it
+- Test their judgment and decision-making
+Examples:
+- "If you discovered a critical bug right before a release, what would you do?"
+- "How would you prioritize multiple urgent tasks?"
+- "A stakeholder requests a feature that conflicts with best practices. How do you respond?"
+
+CLOSING:
+- Thank them for their time
+- Ask if they have questions about the role or company
+- Keep it professional and brief
+Example: "Thank you for your time today. Do you have any questions for me about the role or the team?"
+"""
+
+# Dynamic suffix per phase, built once; only the candidate-specific slots are
+# filled per turn
+def _build_phase_template(phase: InterviewPhase) -> str:
+    """Interviewer prompt suffix for one phase with {placeholders} for per-turn data"""
+    template = (
+        "\nJOB ROLE: {job_role}\n"
+        f"CURRENT INTERVIEW PHASE: {phase.value} (follow the {phase.name} guidance above)\n"
+        "\nCANDIDATE PROFILE:\n"
+        "- Skills: {skills}\n"
+        "- Technologies: {technologies}\n"
+    )
+    if phase == InterviewPhase.TECHNICAL:
+        template += "{tech_context}"
+    template += "{recent_exchange}\nREMEMBER: You are the interviewer. Ask a question, don't answer questions.\n\n"
+    template += "Your closing statement:" if phase == InterviewPhase.CLOSING else "Your next interview question:"
+    return template
+
+_PHASE_TEMPLATES: Dict[InterviewPhase, str] = {
+    phase: _build_phase_template(phase)
+    for phase in InterviewPhase
+    if phase != InterviewPhase.ENDED
+}
+
+STATIC_ANALYZER_PREFIX = """You are Alex, an expert interviewer analyzing a candidate's response.
+
+Analyze the answer given at the end thoroughly and provide:
 
 1. Quality (1-10): How well-structured and articulate is the answer?
 2. Relevance (1-10): How relevant is it to the question asked?
@@ -221,58 +428,111 @@ Suggest follow-up questions to probe deeper into:
 - Contradictions or inconsistencies
 
 Respond in this EXACT JSON format:
-{{
+{
     "quality_score": <int>,
     "relevance_score": <int>,
     "completeness_score": <int>,
     "technical_depth": <int>,
     "communication_quality": <int>,
-    "extracted_info": {{
+    "extracted_info": {
         "skills": [<list of skills>],
         "technologies": [<list of technologies>],
         "experience_level": "<junior/mid/senior>",
         "communication_style": "<formal/casual/technical/etc>",
         "confidence_indicator": "<high/medium/low>",
         "key_points": [<list of key points mentioned>]
-    }},
+    },
     "suggested_follow_ups": [<list of follow-up questions>],
     "areas_to_probe": [<list of topics to explore further>],
     "red_flags": [<list of any concerning aspects>],
     "positive_signs": [<list of positive aspects>]
-}}
+}
 """
 
-    try:
-        payload = {
-            "prompt": prompt,
-            "n_predict": 400,
-            "temperature": 0.3,
-            "top_p": 0.9,
-            "repeat_penalty": 1.1,
-            "stop": ["\n\n", "}", "Candidate:"],
-            "grammar": 'root ::= "{" [^}]+ "}"',
-        }
-        
-        response = requests.post(LLM_URL, json=payload, timeout=15).json()
-        content = response.get("content", "{}")
-        
-        # Extract JSON from response
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            analysis_dict = json.loads(json_match.group())
-        else:
-            analysis_dict = {}
-            
-    except Exception as e:
-        print(f"Analysis error: {e}")
-        analysis_dict = {}
+# GBNF grammar forcing the analyzer to emit exactly the AnswerAnalysis schema.
+# Scores are limited to 1-10 and lists to three items so the output fits n_predict.
+ANALYSIS_GRAMMAR = r'''
+root ::= "{" ws "\"quality_score\":" ws score "," ws "\"relevance_score\":" ws score "," ws "\"completeness_score\":" ws score "," ws "\"technical_depth\":" ws score "," ws "\"communication_quality\":" ws score "," ws "\"extracted_info\":" ws info "," ws "\"suggested_follow_ups\":" ws list "," ws "\"areas_to_probe\":" ws list "," ws "\"red_flags\":" ws list "," ws "\"positive_signs\":" ws list ws "}"
+info ::= "{" ws "\"skills\":" ws list "," ws "\"technologies\":" ws list "," ws "\"experience_level\":" ws level "," ws "\"communication_style\":" ws string "," ws "\"confidence_indicator\":" ws confidence "," ws "\"key_points\":" ws list ws "}"
+level ::= "\"junior\"" | "\"mid\"" | "\"senior\""
+confidence ::= "\"high\"" | "\"medium\"" | "\"low\""
+list ::= "[" ws ( string ( "," ws string )? ( "," ws string )? )? ws "]"
+string ::= "\"" [^"\\\n]* "\""
+score ::= [1-9] | "10"
+ws ::= [ \t\n]*
+'''
+
+# ------------------------------------------------------
+# Enhanced Helper Functions
+# ------------------------------------------------------
+# Patterns used by clean_llm_response, compiled once at import
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL | re.IGNORECASE)
+_THOUGHT_RE = re.compile(r'<thought>.*?</thought>', re.DOTALL | re.IGNORECASE)
+_META_RES = tuple(re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+    r'^.*?(?=(Hello|Hi|Good|Thank|So|Now|Next|Alright|Well|Can you|Could you|What|How|Why|Tell me|Describe|Would you))',
+    r'^(Wait,|Hmm,|Let me see,|Let me think,|I need to|Looking at|The candidate)',
+    r'\(.*?\)',  # Remove parenthetical comments
+    r'\[.*?\]',  # Remove bracketed comments
+))
+# Phrases that mean the AI is giving advice instead of asking a question
+_ADVICE_RE = re.compile('|'.join(map(re.escape, [
+    "you should", "i recommend", "it's important to", "the best time",
+    "generally speaking", "in my experience", "typically",
+    "it depends on", "you'll want to", "you need to"
+])), re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+_NL_RE = re.compile(r'\n+')
+# Advice phrasing; only a giveaway when the text doesn't end up asking anything
+_ADVICE_TAIL_RE = re.compile(r'\b(?:when should|how to)\b', re.IGNORECASE)
+
+def clean_llm_response(text: str) -> str:
+    """Clean LLM response for interview conversation"""
+    # Remove thinking tags
+    cleaned = _THINK_RE.sub('', text)
+    cleaned = _THOUGHT_RE.sub('', cleaned)
     
-    # Default values if analysis fails
-    default_analysis = AnswerAnalysis(
+    # Remove meta commentary and stage directions
+    for pattern in _META_RES:
+        cleaned = pattern.sub('', cleaned)
+    
+    # Detect if AI is trying to answer a question instead of asking one
+    if _ADVICE_RE.search(cleaned):
+        # AI is trying to give advice instead of asking a question
+        # Return empty to trigger fallback
+        return ""
+    
+    # Remove excess whitespace
+    cleaned = _WS_RE.sub(' ', cleaned)
+    cleaned = _NL_RE.sub('\n', cleaned)
+    
+    # Extract only the interviewer's speech (not actions or thoughts)
+    lines = cleaned.split('\n')
+    speech_lines = []
+    for line in lines:
+        # Keep lines that sound like speech, not stage directions
+        if line and not line.startswith(('(', '[', '*')) and len(line) > 10:
+            speech_lines.append(line.strip())
+    
+    result = ' '.join(speech_lines[:2])  # Limit to 1-2 sentences
+    
+    # If result is too short or seems incomplete, return empty to trigger fallback
+    if len(result.split()) < 3:
+        return ""
+    
+    return result.strip()
+
+# Placeholders substituted for the transcript when audio can't be used
+UNCLEAR_AUDIO_TEXT = "I didn't catch that. Could you please repeat?"
+AUDIO_ERROR_TEXT = "There was an issue processing your audio. Could you please try again?"
+MIN_ANALYZABLE_WORDS = 5
+
+def _build_default_analysis(technical_depth: int) -> AnswerAnalysis:
+    """Middle-of-the-road scores with nothing extracted"""
+    return AnswerAnalysis(
         quality_score=5,
         relevance_score=5,
         completeness_score=5,
-        technical_depth=3 if phase == InterviewPhase.TECHNICAL else 1,
+        technical_depth=technical_depth,
         communication_quality=5,
         extracted_info={
             "skills": [],
@@ -285,175 +545,141 @@ Respond in this EXACT JSON format:
         suggested_follow_ups=["Can you tell me more about that?"],
         areas_to_probe=["General follow-up"]
     )
+
+# Built once; callers only read these
+_DEFAULT_TECHNICAL_ANALYSIS = _build_default_analysis(3)
+_DEFAULT_ANALYSIS = _build_default_analysis(1)
+
+def default_analysis(phase: InterviewPhase) -> AnswerAnalysis:
+    """Neutral analysis used when the answer can't be (or wasn't) scored"""
+    return _DEFAULT_TECHNICAL_ANALYSIS if phase == InterviewPhase.TECHNICAL else _DEFAULT_ANALYSIS
+
+async def analyze_candidate_answer(state: InterviewState, question: str, answer: str, phase: InterviewPhase) -> AnswerAnalysis:
+    """Use AI to deeply analyze the candidate's answer"""
     
-    # Merge with actual analysis
-    if analysis_dict:
-        try:
-            return AnswerAnalysis(**analysis_dict)
-        except:
-            return default_analysis
-    return default_analysis
+    # Nothing to score in a placeholder or a few words; skip the LLM round-trip
+    if len(answer.split()) < MIN_ANALYZABLE_WORDS or answer in (UNCLEAR_AUDIO_TEXT, AUDIO_ERROR_TEXT):
+        return default_analysis(phase)
+    
+    prompt = STATIC_ANALYZER_PREFIX + f"""
+JOB ROLE: {state.job_role}
+CURRENT PHASE: {phase.value}
+CURRENT TOPIC: {state.current_topic or 'General'}
+
+QUESTION ASKED: "{question}"
 
-def update_candidate_profile(analysis: AnswerAnalysis):
+CANDIDATE'S ANSWER: "{answer}"
+
+JSON analysis:
+"""
+
+    try:
+        payload = {
+            "prompt": prompt,
+            "n_predict": 300,
+            # Greedy: the grammar fixes the structure, so sampling only adds noise
+            "temperature": 0.0,
+            "top_k": 1,
+            "top_p": 1.0,
+            "repeat_penalty": 1.1,
+            "grammar": ANALYSIS_GRAMMAR,
+            "cache_prompt": True,
+            "id_slot": ANALYZER_SLOT,
+        }
+        
+        response = await llm_async_client.post(LLM_URL, json=payload)
+        
+        # The grammar forces the exact schema, so the output parses as-is
+        return AnswerAnalysis(**orjson.loads(orjson.loads(response.content).get("content", "")))
+            
+    except Exception as e:
+        print(f"Analysis error: {e}")
+    
+    # Default values if analysis fails
+    return default_analysis(phase)
+
+def update_candidate_profile(state: InterviewState, analysis: AnswerAnalysis):
     """Update candidate profile based on analysis"""
     
+    profile = state.candidate_profile
+    
     # Update skills and technologies
     if "skills" in analysis.extracted_info:
         for skill in analysis.extracted_info["skills"]:
-            if skill not in interview_state.candidate_profile.skills:
-                interview_state.candidate_profile.skills.append(skill)
+            if skill not in profile._skills_set:
+                profile._skills_set.add(skill)
+                profile.skills.append(skill)
     
     if "technologies" in analysis.extracted_info:
         for tech in analysis.extracted_info["technologies"]:
-            if tech not in interview_state.candidate_profile.technologies:
-                interview_state.candidate_profile.technologies.append(tech)
+            if tech not in profile._tech_set:
+                profile._tech_set.add(tech)
+                profile.technologies.append(tech)
+    
+    profile.invalidate()
+    state._profile_dump_cache = None
     
     # Update experience estimate
     if "experience_level" in analysis.extracted_info:
         level = analysis.extracted_info["experience_level"]
-        if level == "senior" and (interview_state.candidate_profile.experience_years is None or interview_state.candidate_profile.experience_years < 5):
-            interview_state.candidate_profile.experience_years = 8
-        elif level == "mid" and (interview_state.candidate_profile.experience_years is None or interview_state.candidate_profile.experience_years < 3):
-            interview_state.candidate_profile.experience_years = 4
+        if level == "senior" and (state.candidate_profile.experience_years is None or state.candidate_profile.experience_years < 5):
+            state.candidate_profile.experience_years = 8
+        elif level == "mid" and (state.candidate_profile.experience_years is None or state.candidate_profile.experience_years < 3):
+            state.candidate_profile.experience_years = 4
     
     # Update communication style
     if analysis.communication_quality >= 7:
-        interview_state.candidate_profile.communication_style = "clear and articulate"
+        state.candidate_profile.communication_style = "clear and articulate"
     elif analysis.communication_quality <= 4:
-        interview_state.candidate_profile.communication_style = "needs improvement"
+        state.candidate_profile.communication_style = "needs improvement"
     
     # Update confidence
     if "confidence_indicator" in analysis.extracted_info:
         conf = analysis.extracted_info["confidence_indicator"]
         if conf == "high":
-            interview_state.candidate_profile.confidence_level = 5
+            state.candidate_profile.confidence_level = 5
         elif conf == "low":
-            interview_state.candidate_profile.confidence_level = 2
+            state.candidate_profile.confidence_level = 2
     
     # Add red flags and positive signs
-    interview_state.red_flags.extend(analysis.red_flags)
-    interview_state.positive_signs.extend(analysis.positive_signs)
+    for flag in analysis.red_flags:
+        if flag not in state._red_flags_set:
+            state._red_flags_set.add(flag)
+            state.red_flags.append(flag)
+    for sign in analysis.positive_signs:
+        if sign not in state._positive_signs_set:
+            state._positive_signs_set.add(sign)
+            state.positive_signs.append(sign)
     
     # Adjust difficulty based on performance
     avg_score = (analysis.quality_score + analysis.relevance_score + analysis.completeness_score) / 3
     if avg_score >= 8:
-        interview_state.difficulty_level = min(5, interview_state.difficulty_level + 1)
+        state.difficulty_level = min(5, state.difficulty_level + 1)
     elif avg_score <= 5:
-        interview_state.difficulty_level = max(1, interview_state.difficulty_level - 1)
+        state.difficulty_level = max(1, state.difficulty_level - 1)
 
-def generate_adaptive_question(last_answer_analysis: Optional[AnswerAnalysis] = None) -> str:
+async def generate_adaptive_question(state: InterviewState, last_answer_analysis: Optional[AnswerAnalysis] = None) -> str:
     """Generate next question based on conversation context and analysis"""
     
-    # Build comprehensive prompt for adaptive questioning
-    prompt = f"""You are Alex, a professional job interviewer. Your ONLY job is to ask interview questions.
-
-CRITICAL RULES:
-1. You are the INTERVIEWER, not the candidate
-2. You ASK questions, you do NOT answer questions
-3. If the candidate asks you a question, politely redirect and ask your own question
-4. Never provide career advice, job search tips, or answer "when should I..." questions
-5. Stay focused on evaluating the candidate for the {interview_state.job_role} position
-
-CURRENT INTERVIEW PHASE: {interview_state.phase.value}
-
-CANDIDATE PROFILE:
-- Skills: {', '.join(interview_state.candidate_profile.skills[:3]) if interview_state.candidate_profile.skills else 'Unknown'}
-- Technologies: {', '.join(interview_state.candidate_profile.technologies[:3]) if interview_state.candidate_profile.technologies else 'Unknown'}
-
-YOUR TASK FOR THIS PHASE:
-"""
-
-    # Phase-specific instructions
-    if interview_state.phase == InterviewPhase.GREETING:
-        prompt += f"""
-- Greet the candidate warmly
-- Introduce yourself as Alex, the interviewer
-- Ask them to introduce themselves and their background
-- Keep it brief (1-2 sentences)
-
-Example: "Hello! I'm Alex, and I'll be interviewing you today for the {interview_state.job_role} position. Could you please tell me about yourself?"
-
-Your question:"""
-
-    elif interview_state.phase == InterviewPhase.INTRODUCTION:
-        prompt += f"""
-- Ask about their background, experience, or motivation
-- Focus on understanding their career journey
-- Ask ONE clear question
-
-Examples:
-- "What drew you to apply for this {interview_state.job_role} role?"
-- "Can you walk me through your relevant work experience?"
-- "What are you looking for in your next position?"
-
-Your question:"""
-
-    elif interview_state.phase == InterviewPhase.TECHNICAL:
-        tech_context = ""
-        if interview_state.candidate_profile.technologies:
-            tech_context = f"\nThey mentioned: {', '.join(interview_state.candidate_profile.technologies[:2])}"
-        
-        prompt += f"""
-- Ask a technical question relevant to {interview_state.job_role}{tech_context}
-- Test their knowledge and problem-solving ability
-- Ask ONE specific technical question
-
-Examples:
-- "Can you explain how you would approach debugging a performance issue?"
-- "Describe your experience with database optimization."
-- "How do you ensure code quality in your projects?"
-
-Your question:"""
-
-    elif interview_state.phase == InterviewPhase.BEHAVIORAL:
-        prompt += """
-- Ask about past experiences, teamwork, or challenges
-- Use behavioral interview techniques (STAR method)
-- Ask ONE behavioral question
-
-Examples:
-- "Tell me about a time you faced a difficult deadline. How did you handle it?"
-- "Describe a situation where you had to resolve a conflict with a teammate."
-- "What's your approach to receiving critical feedback?"
-
-Your question:"""
-
-    elif interview_state.phase == InterviewPhase.SITUATIONAL:
-        prompt += f"""
-- Present a hypothetical scenario related to {interview_state.job_role}
-- Ask how they would handle it
-- Test their judgment and decision-making
-
-Examples:
-- "If you discovered a critical bug right before a release, what would you do?"
-- "How would you prioritize multiple urgent tasks?"
-- "A stakeholder requests a feature that conflicts with best practices. How do you respond?"
-
-Your question:"""
-
-    elif interview_state.phase == InterviewPhase.CLOSING:
-        prompt += """
-- Thank them for their time
-- Ask if they have questions about the role or company
-- Keep it professional and brief
-
-Example: "Thank you for your time today. Do you have any questions for me about the role or the team?"
-
-Your closing statement:"""
-
-    else:
+    if state.phase == InterviewPhase.ENDED:
         return "Thank you for participating in this interview. We'll be in touch soon."
-
-    # Add conversation context if available
-    if interview_state.conversation_history:
-        recent = interview_state.conversation_history[-2:]
-        context_str = "\n".join([
-            f"{'You' if h['role'] == 'interviewer' else 'Candidate'}: {h['content'][:100]}"
-            for h in recent
-        ])
-        prompt += f"\n\nRECENT EXCHANGE:\n{context_str}\n\n"
-
-    prompt += "\nREMEMBER: You are the interviewer. Ask a question, don't answer questions.\n\nYour next interview question:"
+    
+    # Everything session-specific goes after the static prefix so the KV cache stays valid
+    profile = state.candidate_profile
+    tech_context = ""
+    if profile.technologies:
+        tech_context = f"They mentioned: {profile.csv('technologies', 2)}\n"
+    recent_exchange = ""
+    if state.conversation_history:
+        recent_exchange = f"\nRECENT EXCHANGE:\n{state.get_conversation_context(2)}\n"
+    
+    prompt = STATIC_INTERVIEWER_PREFIX + _PHASE_TEMPLATES[state.phase].format(
+        job_role=state.job_role,
+        skills=profile.csv('skills', 3) or 'Unknown',
+        technologies=profile.csv('technologies', 3) or 'Unknown',
+        tech_context=tech_context,
+        recent_exchange=recent_exchange
+    )
 
     try:
         payload = {
@@ -463,20 +689,22 @@ Your closing statement:"""
             "top_p": 0.9,
             "repeat_penalty": 1.2,
             "stop": ["\n\n", "Candidate:", "They said:", "Answer:", "Q:", "A:"],
+            "cache_prompt": True,
+            "id_slot": INTERVIEWER_SLOT,
         }
         
-        response = requests.post(LLM_URL, json=payload, timeout=10).json()
-        question = response.get("content", "").strip()
+        response = await llm_async_client.post(LLM_URL, json=payload, timeout=10)
+        question = orjson.loads(response.content).get("content", "").strip()
         
         # Clean the response
         question = clean_llm_response(question)
         
         # Validate it's actually a question
         if not question:
-            question = get_fallback_question()
-        elif "when should" in question.lower() or "how to" in question.lower() and "?" not in question[-50:]:
+            question = get_fallback_question(state)
+        elif _ADVICE_TAIL_RE.search(question) and "?" not in question[-50:]:
             # AI is trying to answer instead of ask
-            question = get_fallback_question()
+            question = get_fallback_question(state)
         
         # Ensure it ends with a question mark
         if not question.endswith('?'):
@@ -484,76 +712,72 @@ Your closing statement:"""
             
     except Exception as e:
         print(f"Question generation error: {e}")
-        question = get_fallback_question()
+        question = get_fallback_question(state)
     
     return question
 
-def get_fallback_question() -> str:
+# Fallback questions, built once; {role} is filled in at selection time
+_FALLBACKS: Dict[InterviewPhase, List[str]] = {
+    InterviewPhase.GREETING: [
+        "Hello! I'm Alex. Could you tell me about your background and what draws you to this {role} position?"
+    ],
+    InterviewPhase.INTRODUCTION: [
+        "What aspects of your previous experience are most relevant to this role?",
+        "Can you walk me through a project that showcases your skills?",
+        "What are your career goals and how does this position fit into them?"
+    ],
+    InterviewPhase.BEHAVIORAL: [
+        "Tell me about a time you faced a significant obstacle at work and how you overcame it.",
+        "Describe a situation where you had to collaborate with a difficult team member.",
+        "How do you handle receiving critical feedback on your work?"
+    ],
+    InterviewPhase.SITUATIONAL: [
+        "If you joined as a {role} and found a critical bug right before launch, what would you do?",
+        "How would you prioritize multiple high-priority tasks with competing deadlines?",
+        "Describe how you'd mentor a junior developer struggling with a task."
+    ],
+    InterviewPhase.CLOSING: [
+        "We're almost out of time. Is there anything important about your experience we haven't covered?",
+        "Do you have any questions for me about the role or the team?",
+        "Thank you for your time today. What are your next steps or timeline?"
+    ]
+}
+
+_TECH_FALLBACKS_BY_LEVEL: Dict[int, List[str]] = {
+    1: ["Can you explain a basic programming concept like inheritance or polymorphism?"],
+    2: ["How would you approach debugging a performance issue in production?"],
+    3: ["Can you describe a time you had to make a significant architectural decision?"],
+    4: ["How do you ensure code quality and maintainability in large codebases?"],
+    5: ["Describe the most complex technical challenge you've solved and your approach."]
+}
+
+_GENERIC_FALLBACKS = ["Could you tell me more about that?"]
+
+def get_fallback_question(state: InterviewState) -> str:
     """Intelligent fallback questions based on phase and context"""
     
-    phase = interview_state.phase
-    role = interview_state.job_role
-    
-    fallbacks = {
-        InterviewPhase.GREETING: [
-            f"Hello! I'm Alex. Could you tell me about your background and what draws you to this {role} position?"
-        ],
-        InterviewPhase.INTRODUCTION: [
-            "What aspects of your previous experience are most relevant to this role?",
-            "Can you walk me through a project that showcases your skills?",
-            "What are your career goals and how does this position fit into them?"
-        ],
-        InterviewPhase.TECHNICAL: {
-            1: ["Can you explain a basic programming concept like inheritance or polymorphism?"],
-            2: ["How would you approach debugging a performance issue in production?"],
-            3: ["Can you describe a time you had to make a significant architectural decision?"],
-            4: ["How do you ensure code quality and maintainability in large codebases?"],
-            5: ["Describe the most complex technical challenge you've solved and your approach."]
-        },
-        InterviewPhase.BEHAVIORAL: [
-            "Tell me about a time you faced a significant obstacle at work and how you overcame it.",
-            "Describe a situation where you had to collaborate with a difficult team member.",
-            "How do you handle receiving critical feedback on your work?"
-        ],
-        InterviewPhase.SITUATIONAL: [
-            f"If you joined as a {role} and found a critical bug right before launch, what would you do?",
-            "How would you prioritize multiple high-priority tasks with competing deadlines?",
-            "Describe how you'd mentor a junior developer struggling with a task."
-        ],
-        InterviewPhase.CLOSING: [
-            "We're almost out of time. Is there anything important about your experience we haven't covered?",
-            "Do you have any questions for me about the role or the team?",
-            "Thank you for your time today. What are your next steps or timeline?"
-        ]
-    }
-    
-    if phase == InterviewPhase.TECHNICAL:
-        level_fallbacks = fallbacks[phase].get(interview_state.difficulty_level, fallbacks[phase][3])
-        import random
-        return random.choice(level_fallbacks)
-    else:
-        import random
-        return random.choice(fallbacks.get(phase, ["Could you tell me more about that?"]))
+    if state.phase == InterviewPhase.TECHNICAL:
+        return random.choice(_TECH_FALLBACKS_BY_LEVEL.get(state.difficulty_level, _TECH_FALLBACKS_BY_LEVEL[3]))
+    return random.choice(_FALLBACKS.get(state.phase, _GENERIC_FALLBACKS)).format(role=state.job_role)
 
-def should_transition_phase() -> bool:
+def should_transition_phase(state: InterviewState, now: Optional[datetime] = None) -> bool:
     """Determine if we should transition to next phase"""
     
-    if interview_state.phase == InterviewPhase.ENDED:
+    if state.phase == InterviewPhase.ENDED:
         return False
     
-    phase_config = PHASE_CONFIG.get(interview_state.phase, {})
+    phase_config = PHASE_CONFIG.get(state.phase, {})
     min_q = phase_config.get("min_questions", 2)
     max_q = phase_config.get("max_questions", 5)
     
     # Count questions in current phase
-    phase_questions = sum(1 for q in interview_state.questions_asked 
-                         if q.get("phase") == interview_state.phase)
+    phase_questions = state.phase_question_count()
     
     # Check if we've asked enough questions
     if phase_questions >= min_q:
         # Check time limit
-        if interview_state.phase_start_time:
-            time_elapsed = datetime.now() - interview_state.phase_start_time
+        if state.phase_start_time:
+            time_elapsed = (now or datetime.now()) - state.phase_start_time
             time_limit = phase_config.get("time_limit", timedelta(minutes=10))
             if time_elapsed >= time_limit:
                 return True
@@ -563,15 +787,16 @@ def should_transition_phase() -> bool:
             return True
         
         # For technical phase, check if we've covered enough depth
-        if interview_state.phase == InterviewPhase.TECHNICAL:
-            if len(interview_state.candidate_profile.technologies) >= 3 and phase_questions >= 4:
+        if state.phase == InterviewPhase.TECHNICAL:
+            if len(state.candidate_profile.technologies) >= 3 and phase_questions >= 4:
                 return True
     
     return False
 
-def transition_to_next_phase():
+def transition_to_next_phase(state: InterviewState, now: Optional[datetime] = None):
     """Move to next interview phase"""
     
+    now = now or datetime.now()
     phase_order = [
         InterviewPhase.GREETING,
         InterviewPhase.INTRODUCTION,
@@ -581,18 +806,126 @@ def transition_to_next_phase():
         InterviewPhase.CLOSING
     ]
     
-    current_idx = phase_order.index(interview_state.phase)
+    current_idx = phase_order.index(state.phase)
     
     if current_idx < len(phase_order) - 1:
-        interview_state.phase = phase_order[current_idx + 1]
-        interview_state.phase_start_time = datetime.now()
-        interview_state.current_topic = None
+        state.phase = phase_order[current_idx + 1]
+        state.phase_start_time = now
+        state.current_topic = None
         return True
     else:
-        interview_state.phase = InterviewPhase.ENDED
-        interview_state.end_time = datetime.now()
+        state.phase = InterviewPhase.ENDED
+        state.end_time = now
         return False
 
+# ------------------------------------------------------
+# Semantic Assessment Cache
+# ------------------------------------------------------
+class AssessmentCache:
+    """Reuse report assessments for interviews with the same scored facts.
+    
+    Only entries whose exact-match key (job role, rounded averages, flags)
+    equals the lookup key are candidates; among those, the embedding of the
+    candidate-specific text must also be a near-duplicate.
+    """
+    
+    def __init__(
+        self,
+        path: str = "./assessment_cache.npz",
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.95,
+        ttl: timedelta = timedelta(hours=24),
+        max_entries: int = 1000
+    ):
+        self.path = path
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._model = None
+        # Row i of _vectors is the L2-normalized embedding of the text behind _entries[i]
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Tuple[datetime, str, Dict]] = []
+        self._load()
+    
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+    
+    async def lookup(self, text: str, key: str) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
+        """Return the text embedding and a cached assessment with the same key if one is close enough"""
+        try:
+            # Encoding is CPU/GPU work; keep it off the event loop
+            vec = await asyncio.to_thread(self._embed, text)
+        except Exception as e:
+            print(f"Assessment cache embedding failed: {e}")
+            return None, None
+        
+        if vec is None or self._vectors is None:
+            return vec, None
+        
+        same_key = np.array([k == key for _, k, _ in self._entries])
+        if not same_key.any():
+            return vec, None
+        
+        # Dot product of normalized vectors is cosine similarity
+        scores = np.where(same_key, self._vectors @ vec, -1.0)
+        best = int(np.argmax(scores))
+        created, _, assessment = self._entries[best]
+        if scores[best] >= self.threshold and datetime.now() - created < self.ttl:
+            return vec, assessment
+        return vec, None
+    
+    def store(self, vec: Optional[np.ndarray], key: str, assessment: Dict):
+        """Add an assessment, dropping expired and oldest entries beyond max_entries"""
+        if vec is None:
+            return
+        
+        now = datetime.now()
+        keep = [i for i, (created, _, _) in enumerate(self._entries) if now - created < self.ttl]
+        keep = keep[-(self.max_entries - 1):] if self.max_entries > 1 else []
+        
+        self._entries = [self._entries[i] for i in keep] + [(now, key, assessment)]
+        rows = [self._vectors[keep]] if keep else []
+        self._vectors = np.vstack(rows + [vec[np.newaxis, :]])
+    
+    def save(self):
+        """Persist the cache so it survives restarts"""
+        if self._vectors is None:
+            return
+        try:
+            np.savez(
+                self.path,
+                vectors=self._vectors,
+                created=np.array([created.timestamp() for created, _, _ in self._entries]),
+                keys=np.frombuffer(orjson.dumps([k for _, k, _ in self._entries]), dtype=np.uint8),
+                assessments=np.frombuffer(orjson.dumps([a for _, _, a in self._entries]), dtype=np.uint8)
+            )
+        except Exception as e:
+            print(f"Assessment cache save failed: {e}")
+    
+    def _load(self):
+        try:
+            with np.load(self.path) as data:
+                if "keys" not in data:
+                    # Written before entries were keyed; those assessments can't be matched safely
+                    return
+                assessments = orjson.loads(data["assessments"].tobytes())
+                keys = orjson.loads(data["keys"].tobytes())
+                created = [datetime.fromtimestamp(t) for t in data["created"]]
+                self._vectors = data["vectors"]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Assessment cache load failed: {e}")
+            return
+        self._entries = list(zip(created, keys, assessments))
+
+assessment_cache = AssessmentCache()
+
 # ------------------------------------------------------
 # API Endpoints
 # ------------------------------------------------------
@@ -603,43 +936,47 @@ class StartInterviewRequest(BaseModel):
 @app.post("/start-interview")
 async def start_interview(request: StartInterviewRequest):
     """Start a new interview session"""
-    global interview_state
-    interview_state = InterviewState()
-    interview_state.job_role = request.job_role
-    interview_state.interview_focus_areas = request.focus_areas or []
-    interview_state.start_time = datetime.now()
-    interview_state.phase_start_time = interview_state.start_time
-    interview_state.phase = InterviewPhase.GREETING
+    session_id, state = sessions.create()
+    state.job_role = request.job_role
+    state.interview_focus_areas = request.focus_areas or []
+    now_ts = time.time()
+    now = datetime.fromtimestamp(now_ts)
+    state.start_time = now
+    state.phase_start_time = now
+    state.phase = InterviewPhase.GREETING
     
     # Generate initial greeting
-    greeting = generate_adaptive_question()
+    greeting = await generate_adaptive_question(state)
     
-    interview_state.questions_asked.append({
-        "question": greeting,
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
-    })
+    state.add_question(greeting, now_ts)
     
-    interview_state.conversation_history.append({
+    state.add_turn({
         "role": "interviewer",
         "content": greeting,
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
+        "phase": state.phase.value,
+        "timestamp": now_ts
     })
     
     return {
         "status": "Interview started",
-        "job_role": interview_state.job_role,
-        "phase": interview_state.phase.value,
+        "job_role": state.job_role,
+        "phase": state.phase.value,
         "interviewer_message": greeting,
-        "session_id": id(interview_state)
+        "session_id": session_id
     }
 
 @app.post("/interview-response")
-async def interview_response(file: UploadFile = File(...)):
+async def interview_response(
+    file: UploadFile = File(...),
+    state: InterviewState = Depends(session_state)
+):
     """Process candidate's voice response during interview"""
     
-    if interview_state.phase == InterviewPhase.ENDED:
+    # One clock read per request, shared by every record it writes
+    now_ts = time.time()
+    now = datetime.fromtimestamp(now_ts)
+    
+    if state.phase == InterviewPhase.ENDED:
         return {
             "error": "Interview has ended. Please start a new interview or request the report.",
             "interviewer_message": "The interview has concluded. Thank you for your time."
@@ -651,58 +988,75 @@ async def interview_response(file: UploadFile = File(...)):
     
     # Transcribe audio
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(await file.read())
-            audio_path = tmp.name
+        # Decode straight from the spooled upload without copying it into a bytes object;
+        # PyAV handles the browser's webm/opus as well as wav
+        await file.seek(0)
+        audio = decode_audio(file.file, sampling_rate=16000)
         
-        segments, _ = whisper_model.transcribe(audio_path)
+        segments, _ = batched_model.transcribe(
+            audio,
+            batch_size=WHISPER_BATCH_SIZE,
+            vad_filter=True,
+            without_timestamps=True,
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            condition_on_previous_text=False
+        )
         user_text = " ".join([s.text for s in segments]).strip()
         
         if not user_text or len(user_text.split()) < 2:
-            user_text = "I didn't catch that. Could you please repeat?"
+            user_text = UNCLEAR_AUDIO_TEXT
     
     except Exception as e:
         print(f"Transcription error: {e}")
-        user_text = "There was an issue processing your audio. Could you please try again?"
+        user_text = AUDIO_ERROR_TEXT
     
     # Get last question
-    last_question = interview_state.questions_asked[-1]["question"] if interview_state.questions_asked else ""
+    last_question = state.questions_asked[-1]["question"] if state.questions_asked else ""
     
-    # Analyze the answer deeply
-    analysis = analyze_candidate_answer(last_question, user_text, interview_state.phase)
+    # Add to conversation history now so the speculative question sees this answer;
+    # scores are filled in once the analysis completes
+    candidate_turn = {
+        "role": "candidate",
+        "content": user_text,
+        "timestamp": now_ts
+    }
+    state.add_turn(candidate_turn)
+    
+    # Analyze the answer and speculatively generate the next question for the
+    # current phase concurrently, hiding one LLM round-trip behind the other
+    answered_phase = state.phase
+    analysis, next_question = await asyncio.gather(
+        analyze_candidate_answer(state, last_question, user_text, answered_phase),
+        generate_adaptive_question(state)
+    )
     
-    # Store answer with analysis
-    answer_record = {
-        "answer": user_text,
-        "analysis": analysis.dict(),
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
+    candidate_turn["analysis_scores"] = {
+        "quality": analysis.quality_score,
+        "relevance": analysis.relevance_score,
+        "completeness": analysis.completeness_score
     }
-    interview_state.answers_received.append(answer_record)
     
-    # Update candidate profile based on analysis
-    update_candidate_profile(analysis)
+    # Store answer with analysis
+    state.add_answer(AnswerRecord(
+        answer=user_text,
+        analysis=analysis,
+        phase=answered_phase.value,
+        timestamp=now_ts
+    ))
     
-    # Add to conversation history
-    interview_state.conversation_history.append({
-        "role": "candidate",
-        "content": user_text,
-        "analysis_scores": {
-            "quality": analysis.quality_score,
-            "relevance": analysis.relevance_score,
-            "completeness": analysis.completeness_score
-        },
-        "timestamp": datetime.now().isoformat()
-    })
+    # Update candidate profile based on analysis
+    update_candidate_profile(state, analysis)
     
     # Check if we should transition phases
-    if should_transition_phase():
-        if not transition_to_next_phase():
+    if should_transition_phase(state, now):
+        if not transition_to_next_phase(state, now):
             # Interview ended
             return {
                 "transcript": user_text,
                 "interviewer_message": "Thank you for your time. The interview is now complete.",
-                "phase": interview_state.phase.value,
+                "phase": state.phase.value,
                 "analysis_scores": {
                     "quality": analysis.quality_score,
                     "relevance": analysis.relevance_score,
@@ -711,28 +1065,25 @@ async def interview_response(file: UploadFile = File(...)):
                 "interview_ended": True
             }
     
-    # Generate adaptive next question
-    next_question = generate_adaptive_question(analysis)
+    # The speculative question targeted the previous phase; regenerate after a transition
+    if state.phase != answered_phase:
+        next_question = await generate_adaptive_question(state, analysis)
     
     # Store question
-    interview_state.questions_asked.append({
-        "question": next_question,
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
-    })
+    state.add_question(next_question, now_ts)
     
     # Add to conversation history
-    interview_state.conversation_history.append({
+    state.add_turn({
         "role": "interviewer",
         "content": next_question,
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
+        "phase": state.phase.value,
+        "timestamp": now_ts
     })
     
     return {
         "transcript": user_text,
         "interviewer_message": next_question,
-        "phase": interview_state.phase.value,
+        "phase": state.phase.value,
         "analysis_scores": {
             "quality": analysis.quality_score,
             "relevance": analysis.relevance_score,
@@ -741,42 +1092,45 @@ async def interview_response(file: UploadFile = File(...)):
             "communication_quality": analysis.communication_quality
         },
         "candidate_profile_update": {
-            "skills": interview_state.candidate_profile.skills[-3:],
-            "technologies": interview_state.candidate_profile.technologies[-3:],
-            "difficulty_level": interview_state.difficulty_level
+            "skills": state.candidate_profile.skills[-3:],
+            "technologies": state.candidate_profile.technologies[-3:],
+            "difficulty_level": state.difficulty_level
         },
-        "questions_asked": len(interview_state.questions_asked),
-        "interview_ended": interview_state.phase == InterviewPhase.ENDED
+        "questions_asked": len(state.questions_asked),
+        "interview_ended": state.phase == InterviewPhase.ENDED
     }
 
 @app.post("/text-response")
-async def text_interview_response(user_text: str):
+async def text_interview_response(user_text: str, state: InterviewState = Depends(session_state)):
     """Alternative endpoint for text-only responses (for testing)"""
     
-    if interview_state.phase == InterviewPhase.ENDED:
+    now_ts = time.time()
+    now = datetime.fromtimestamp(now_ts)
+    
+    if state.phase == InterviewPhase.ENDED:
         return {
             "error": "Interview has ended.",
             "interviewer_message": "The interview is complete. Thank you."
         }
     
-    last_question = interview_state.questions_asked[-1]["question"] if interview_state.questions_asked else ""
+    last_question = state.questions_asked[-1]["question"] if state.questions_asked else ""
     
     # Analyze the answer
-    analysis = analyze_candidate_answer(last_question, user_text, interview_state.phase)
+    analysis = await analyze_candidate_answer(state, last_question, user_text, state.phase)
     
     # Store answer with analysis
-    interview_state.answers_received.append({
-        "answer": user_text,
-        "analysis": analysis.dict(),
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
-    })
+    state.add_answer(AnswerRecord(
+        answer=user_text,
+        analysis=analysis,
+        phase=state.phase.value,
+        timestamp=now_ts
+    ))
     
     # Update candidate profile
-    update_candidate_profile(analysis)
+    update_candidate_profile(state, analysis)
     
     # Add to conversation history
-    interview_state.conversation_history.append({
+    state.add_turn({
         "role": "candidate",
         "content": user_text,
         "analysis_scores": {
@@ -784,12 +1138,12 @@ async def text_interview_response(user_text: str):
             "relevance": analysis.relevance_score,
             "completeness": analysis.completeness_score
         },
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_ts
     })
     
     # Check phase transition
-    if should_transition_phase():
-        if not transition_to_next_phase():
+    if should_transition_phase(state, now):
+        if not transition_to_next_phase(state, now):
             return {
                 "interviewer_message": "Thank you. The interview is now complete.",
                 "phase": "ended",
@@ -797,18 +1151,14 @@ async def text_interview_response(user_text: str):
             }
     
     # Generate next question
-    next_question = generate_adaptive_question(analysis)
+    next_question = await generate_adaptive_question(state, analysis)
     
     # Store question
-    interview_state.questions_asked.append({
-        "question": next_question,
-        "phase": interview_state.phase.value,
-        "timestamp": datetime.now().isoformat()
-    })
+    state.add_question(next_question, now_ts)
     
     return {
         "interviewer_message": next_question,
-        "phase": interview_state.phase.value,
+        "phase": state.phase.value,
         "analysis_scores": {
             "quality": analysis.quality_score,
             "relevance": analysis.relevance_score,
@@ -817,84 +1167,118 @@ async def text_interview_response(user_text: str):
     }
 
 @app.get("/interview-status")
-async def get_interview_status():
+async def get_interview_status(state: InterviewState = Depends(session_state)):
     """Get current interview status and candidate profile"""
     
-    phase_questions = sum(1 for q in interview_state.questions_asked 
-                         if q.get("phase") == interview_state.phase.value)
-    
     return {
-        "phase": interview_state.phase.value,
-        "job_role": interview_state.job_role,
-        "questions_asked_total": len(interview_state.questions_asked),
-        "phase_question_count": phase_questions,
-        "phase_start_time": interview_state.phase_start_time.isoformat() if interview_state.phase_start_time else None,
-        "difficulty_level": interview_state.difficulty_level,
+        "phase": state.phase.value,
+        "job_role": state.job_role,
+        "questions_asked_total": len(state.questions_asked),
+        "phase_question_count": state.phase_question_count(),
+        "phase_start_time": state.phase_start_time,
+        "difficulty_level": state.difficulty_level,
         "candidate_profile": {
-            "skills": interview_state.candidate_profile.skills,
-            "technologies": interview_state.candidate_profile.technologies,
-            "experience_years": interview_state.candidate_profile.experience_years,
-            "confidence_level": interview_state.candidate_profile.confidence_level,
-            "communication_style": interview_state.candidate_profile.communication_style
+            "skills": state.candidate_profile.skills,
+            "technologies": state.candidate_profile.technologies,
+            "experience_years": state.candidate_profile.experience_years,
+            "confidence_level": state.candidate_profile.confidence_level,
+            "communication_style": state.candidate_profile.communication_style
         },
         "conversation_summary": {
-            "total_exchanges": len(interview_state.conversation_history),
-            "last_topic": interview_state.current_topic
+            "total_exchanges": state.total_turns,
+            "last_topic": state.current_topic
         }
     }
 
 @app.post("/end-interview")
-async def end_interview():
+async def end_interview(state: InterviewState = Depends(session_state)):
     """End the interview early"""
-    interview_state.end_time = datetime.now()
-    interview_state.phase = InterviewPhase.ENDED
+    state.end_time = datetime.now()
+    state.phase = InterviewPhase.ENDED
     
     return {
         "status": "Interview ended",
         "message": "Interview terminated. You can request the report.",
-        "duration": str(interview_state.end_time - interview_state.start_time) if interview_state.start_time else None,
-        "total_questions": len(interview_state.questions_asked)
+        "duration": str(state.end_time - state.start_time) if state.start_time else None,
+        "total_questions": len(state.questions_asked)
     }
 
+async def stream_llm_json(payload: Dict) -> Optional[str]:
+    """Stream a completion and return the first JSON object as soon as it closes"""
+    content = ""
+    async with llm_async_client.stream("POST", LLM_URL, json={**payload, "stream": True}) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            chunk = orjson.loads(line[6:])
+            piece = chunk.get("content", "")
+            content += piece
+            # Stop reading once the object is complete; closing the stream ends generation
+            if "}" in piece:
+                json_text = ResponseCleaner.extract_json_object(content)
+                if json_text:
+                    return json_text
+            if chunk.get("stop"):
+                break
+    return ResponseCleaner.extract_json_object(content)
+
+# Report fallbacks when the model returns no JSON / the call fails
+_DEFAULT_ASSESSMENT = {
+    "recommendation": "Hire",
+    "strengths": ["Good communication", "Relevant skills"],
+    "improvement_areas": ["Could benefit from more experience"],
+    "next_steps": ["Technical assessment", "Team interview"],
+    "fit_score": 7,
+    "summary": "Competent candidate with room for growth"
+}
+
+_FAILED_ASSESSMENT = {
+    "recommendation": "Requires further evaluation",
+    "fit_score": 5,
+    "summary": "Interview completed, manual review recommended"
+}
+
 @app.get("/interview-report")
-async def get_interview_report():
+async def get_interview_report(state: InterviewState = Depends(session_state)):
     """Generate comprehensive interview report with AI analysis"""
     
-    if not interview_state.answers_received:
+    if not state.answers_received:
         raise HTTPException(status_code=400, detail="No interview data available")
     
-    # Calculate overall scores
-    total_answers = len(interview_state.answers_received)
-    avg_quality = sum(a["analysis"]["quality_score"] for a in interview_state.answers_received) / total_answers
-    avg_relevance = sum(a["analysis"]["relevance_score"] for a in interview_state.answers_received) / total_answers
-    avg_completeness = sum(a["analysis"]["completeness_score"] for a in interview_state.answers_received) / total_answers
-    
-    # Phase-wise analysis
-    phase_scores = {}
-    for answer in interview_state.answers_received:
-        phase = answer["phase"]
-        if phase not in phase_scores:
-            phase_scores[phase] = []
-        phase_scores[phase].append({
-            "quality": answer["analysis"]["quality_score"],
-            "relevance": answer["analysis"]["relevance_score"],
-            "completeness": answer["analysis"]["completeness_score"]
-        })
+    # Overall and per-phase running sums of [quality, relevance, completeness, count] in one pass
+    overall = [0, 0, 0, 0]
+    per_phase: Dict[str, List[int]] = {}
+    for answer in state.answers_received:
+        analysis = answer.analysis
+        q, r, c = analysis.quality_score, analysis.relevance_score, analysis.completeness_score
+        sums = per_phase.get(answer.phase)
+        if sums is None:
+            sums = per_phase[answer.phase] = [0, 0, 0, 0]
+        for acc in (overall, sums):
+            acc[0] += q
+            acc[1] += r
+            acc[2] += c
+            acc[3] += 1
+    
+    total_answers = overall[3]
+    avg_quality = overall[0] / total_answers
+    avg_relevance = overall[1] / total_answers
+    avg_completeness = overall[2] / total_answers
     
     # Generate AI-powered final assessment
     assessment_prompt = f"""
-Based on this interview for {interview_state.job_role}, provide a final assessment:
+Based on this interview for {state.job_role}, provide a final assessment:
 
 Candidate Profile:
-- Skills: {', '.join(interview_state.candidate_profile.skills)}
-- Technologies: {', '.join(interview_state.candidate_profile.technologies)}
-- Experience Level: {interview_state.candidate_profile.experience_years or 'Unknown'} years
-- Communication Style: {interview_state.candidate_profile.communication_style}
+- Skills: {state.candidate_profile.csv('skills')}
+- Technologies: {state.candidate_profile.csv('technologies')}
+- Experience Level: {state.candidate_profile.experience_years or 'Unknown'} years
+- Communication Style: {state.candidate_profile.communication_style}
 - Average Scores: Quality={avg_quality:.1f}/10, Relevance={avg_relevance:.1f}/10, Completeness={avg_completeness:.1f}/10
 
 Key Observations:
-- Red Flags: {', '.join(interview_state.red_flags[:3]) if interview_state.red_flags else 'None noted'}
-- Positive Signs: {', '.join(interview_state.positive_signs[:3]) if interview_state.positive_signs else 'Several positive indicators'}
+- Red Flags: {', '.join(state.red_flags[:3]) if state.red_flags else 'None noted'}
+- Positive Signs: {', '.join(state.positive_signs[:3]) if state.positive_signs else 'Several positive indicators'}
 
 Provide a concise assessment including:
 1. Overall recommendation (Strong Hire/Hire/Maybe/No Hire)
@@ -914,51 +1298,62 @@ Format as JSON:
 }}
 """
     
-    try:
-        payload = {
-            "prompt": assessment_prompt,
-            "n_predict": 300,
-            "temperature": 0.3,
-            "stop": ["\n\n"],
-        }
-        
-        response = requests.post(LLM_URL, json=payload, timeout=15).json()
-        content = response.get("content", "{}")
-        
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            assessment = json.loads(json_match.group())
-        else:
-            assessment = {
-                "recommendation": "Hire",
-                "strengths": ["Good communication", "Relevant skills"],
-                "improvement_areas": ["Could benefit from more experience"],
-                "next_steps": ["Technical assessment", "Team interview"],
-                "fit_score": 7,
-                "summary": "Competent candidate with room for growth"
+    # Reuse a cached assessment only when every score-bearing input matches exactly
+    # and the candidate-specific text is a near-duplicate; the prompt boilerplate
+    # would make any two interviews look alike to the embedding model
+    profile = state.candidate_profile
+    cache_key = orjson.dumps([
+        state.job_role,
+        round(avg_quality, 1),
+        round(avg_relevance, 1),
+        round(avg_completeness, 1),
+        sorted(set(state.red_flags)),
+        sorted(set(state.positive_signs)),
+    ]).decode()
+    cache_text = (
+        f"Role: {state.job_role}. Skills: {profile.csv('skills')}. "
+        f"Technologies: {profile.csv('technologies')}. "
+        f"Experience: {profile.experience_years or 'Unknown'} years. "
+        f"Communication: {profile.communication_style}. "
+        f"Red flags: {', '.join(state.red_flags)}. "
+        f"Positive signs: {', '.join(state.positive_signs)}."
+    )
+    prompt_vec, assessment = await assessment_cache.lookup(cache_text, cache_key)
+    
+    if assessment is None:
+        try:
+            payload = {
+                "prompt": assessment_prompt,
+                "n_predict": 300,
+                "temperature": 0.3,
+                "stop": ["\n\n"],
             }
-    except:
-        assessment = {
-            "recommendation": "Requires further evaluation",
-            "fit_score": 5,
-            "summary": "Interview completed, manual review recommended"
-        }
+            
+            json_text = await stream_llm_json(payload)
+            if json_text:
+                assessment = orjson.loads(json_text)
+                assessment_cache.store(prompt_vec, cache_key, assessment)
+            else:
+                assessment = _DEFAULT_ASSESSMENT
+        except:
+            assessment = _FAILED_ASSESSMENT
     
     # Build comprehensive report
+    now = datetime.now()
     duration = None
-    if interview_state.start_time and interview_state.end_time:
-        duration = str(interview_state.end_time - interview_state.start_time)
-    elif interview_state.start_time:
-        duration = str(datetime.now() - interview_state.start_time)
+    if state.start_time and state.end_time:
+        duration = str(state.end_time - state.start_time)
+    elif state.start_time:
+        duration = str(now - state.start_time)
     
     report = {
         "interview_metadata": {
-            "job_role": interview_state.job_role,
-            "start_time": interview_state.start_time.isoformat() if interview_state.start_time else None,
-            "end_time": interview_state.end_time.isoformat() if interview_state.end_time else datetime.now().isoformat(),
+            "job_role": state.job_role,
+            "start_time": state.start_time,
+            "end_time": state.end_time or now,
             "duration": duration,
-            "total_questions": len(interview_state.questions_asked),
-            "phases_covered": list(set(a["phase"] for a in interview_state.answers_received))
+            "total_questions": len(state.questions_asked),
+            "phases_covered": list(state.phases_covered)
         },
         "candidate_assessment": assessment,
         "detailed_scores": {
@@ -969,47 +1364,52 @@ Format as JSON:
             },
             "phase_breakdown": {
                 phase: {
-                    "avg_quality": round(sum(s["quality"] for s in scores) / len(scores), 1),
-                    "avg_relevance": round(sum(s["relevance"] for s in scores) / len(scores), 1),
-                    "avg_completeness": round(sum(s["completeness"] for s in scores) / len(scores), 1),
-                    "question_count": len(scores)
+                    "avg_quality": round(q / n, 1),
+                    "avg_relevance": round(r / n, 1),
+                    "avg_completeness": round(c / n, 1),
+                    "question_count": n
                 }
-                for phase, scores in phase_scores.items()
+                for phase, (q, r, c, n) in per_phase.items()
             }
         },
-        "candidate_profile": interview_state.candidate_profile.dict(),
+        "candidate_profile": state.profile_dump(),
         "qa_transcript": [
             {
-                "phase": interview_state.questions_asked[i]["phase"],
-                "question": interview_state.questions_asked[i]["question"],
-                "answer": interview_state.answers_received[i]["answer"] if i < len(interview_state.answers_received) else None,
-                "analysis": interview_state.answers_received[i]["analysis"] if i < len(interview_state.answers_received) else None
+                "phase": q["phase"],
+                "question": q["question"],
+                "answer": a.answer if a else None,
+                "analysis": a.analysis.dict() if a else None
             }
-            for i in range(len(interview_state.questions_asked))
+            # Answers never outnumber questions; the last question may be unanswered
+            for q, a in zip_longest(state.questions_asked, state.answers_received)
         ],
-        "red_flags": interview_state.red_flags,
-        "positive_signs": interview_state.positive_signs,
-        "difficulty_progression": interview_state.difficulty_level
+        "red_flags": state.red_flags,
+        "positive_signs": state.positive_signs,
+        "difficulty_progression": state.difficulty_level
     }
     
     return report
 
 @app.post("/reset-interview")
-async def reset_interview():
+async def reset_interview(session_id: str = Header(..., alias="X-Session-ID")):
     """Reset interview state"""
-    global interview_state
-    interview_state = InterviewState()
+    async with sessions.lock(session_id):
+        if sessions.pop(session_id) is None:
+            raise HTTPException(status_code=404, detail="Interview session not found or expired")
     return {"status": "Interview reset successfully"}
 
 @app.get("/debug-conversation")
-async def debug_conversation():
+async def debug_conversation(state: InterviewState = Depends(session_state)):
     """Debug endpoint to see conversation history"""
     return {
-        "conversation_history": interview_state.conversation_history,
+        "conversation_history": [
+            {**turn, "timestamp": datetime.fromtimestamp(turn["timestamp"], tz=timezone.utc).isoformat()}
+            for turn in state.conversation_history
+        ],
         "state": {
-            "phase": interview_state.phase.value,
-            "difficulty": interview_state.difficulty_level,
-            "current_topic": interview_state.current_topic
+            "phase": state.phase.value,
+            "difficulty": state.difficulty_level,
+            "current_topic": state.current_topic
         }
     }
 
@@ -3,3 +3,4 @@ from .phases import InterviewPhases, PHASE_ORDER
 from .state import InterviewStateMachine
 from .scoring import AnswerScorer
 from .agents import AgentController
+from .sessions import SessionStore
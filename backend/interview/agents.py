@@ -2,13 +2,15 @@
 Agent orchestration for the AI interviewer system.
 Coordinates all agents: Interviewer, Analysis, Extractor, Adaptive, Report.
 """
-import random
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional, Tuple, List
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Optional, Tuple, List
 from datetime import datetime
 
-from llm.client import llm_client
-from llm.prompts import Prompts, FALLBACK_QUESTIONS
+from llm.client import llm_client, MAX_TOKENS_BY_KIND
+from llm.prompts import Prompts, get_fallback, REPORT_JSON_SCHEMA
 from memory.rag import rag_pipeline
 from memory.extractors import fact_extractor
 from memory.vector_db import memory_store
@@ -56,8 +58,89 @@ class InterviewerAgent:
         Returns:
             The generated question
         """
-        logger.info(f"Generating question for phase: {phase.value}")
+        logger.info("Generating question for phase: %s", phase.value)
         
+        parts = self._build_prompt(
+            phase, job_role, candidate_profile, covered_topics, difficulty_level, recent_context, rag_context
+        )
+        if parts is None:
+            return "Thank you for participating. The interview is now complete."
+        
+        system_prompt, prompt, max_tokens = parts
+        question, is_valid = self.llm.generate_question(
+            prompt, max_tokens=max_tokens, system_prompt=system_prompt
+        )
+        return self._finish_question(question, is_valid, phase, difficulty_level)
+    
+    async def agenerate_question(
+        self,
+        phase: InterviewPhase,
+        job_role: str,
+        candidate_profile: CandidateProfile,
+        covered_topics: List[str],
+        difficulty_level: int,
+        recent_context: str,
+        rag_context: str = "",
+    ) -> str:
+        """Async counterpart of generate_question(); the LLM call runs on the event loop."""
+        logger.info("Generating question for phase: %s", phase.value)
+        
+        parts = self._build_prompt(
+            phase, job_role, candidate_profile, covered_topics, difficulty_level, recent_context, rag_context
+        )
+        if parts is None:
+            return "Thank you for participating. The interview is now complete."
+        
+        system_prompt, prompt, max_tokens = parts
+        question, is_valid = await self.llm.agenerate_question(
+            prompt, max_tokens=max_tokens, system_prompt=system_prompt
+        )
+        return self._finish_question(question, is_valid, phase, difficulty_level)
+    
+    async def astream_question(
+        self,
+        phase: InterviewPhase,
+        job_role: str,
+        candidate_profile: CandidateProfile,
+        covered_topics: List[str],
+        difficulty_level: int,
+        recent_context: str,
+        rag_context: str = "",
+    ) -> AsyncIterator[str]:
+        """
+        Stream the next interview question piece by piece.
+        
+        If the LLM yields nothing, the fallback question is yielded whole.
+        If the stream fails after yielding some text, the error propagates.
+        """
+        parts = self._build_prompt(
+            phase, job_role, candidate_profile, covered_topics, difficulty_level, recent_context, rag_context
+        )
+        if parts is None:
+            yield "Thank you for participating. The interview is now complete."
+            return
+        
+        system_prompt, prompt, max_tokens = parts
+        streamed = False
+        async for piece in self.llm.astream_question(prompt, max_tokens=max_tokens, system_prompt=system_prompt):
+            streamed = streamed or bool(piece.strip())
+            yield piece
+        
+        if not streamed:
+            logger.warning("LLM failed for %s, using fallback", phase.value)
+            yield self._get_fallback(phase, difficulty_level)
+    
+    def _build_prompt(
+        self,
+        phase: InterviewPhase,
+        job_role: str,
+        candidate_profile: CandidateProfile,
+        covered_topics: List[str],
+        difficulty_level: int,
+        recent_context: str,
+        rag_context: str
+    ) -> Optional[Tuple[str, str, int]]:
+        """(system_prompt, prompt, max_tokens) for the phase, or None once the interview is over."""
         # Build candidate info string
         candidate_info = []
         if candidate_profile.skills:
@@ -72,47 +155,39 @@ class InterviewerAgent:
         
         # Generate phase-specific prompt
         if phase == InterviewPhase.GREETING:
-            prompt = Prompts.interviewer_greeting(job_role)
+            system_prompt, prompt = Prompts.interviewer_greeting(job_role)
         elif phase == InterviewPhase.INTRODUCTION:
-            prompt = Prompts.interviewer_introduction(job_role, candidate_str)
+            system_prompt, prompt = Prompts.interviewer_introduction(job_role, candidate_str)
         elif phase == InterviewPhase.TECHNICAL:
             covered = ", ".join(covered_topics[-5:]) if covered_topics else "None yet"
             techs = ", ".join(candidate_profile.technologies[:3]) if candidate_profile.technologies else ""
-            prompt = Prompts.interviewer_technical(job_role, techs, difficulty_level, covered)
+            system_prompt, prompt = Prompts.interviewer_technical(job_role, techs, difficulty_level, covered)
         elif phase == InterviewPhase.BEHAVIORAL:
-            prompt = Prompts.interviewer_behavioral(recent_context)
+            system_prompt, prompt = Prompts.interviewer_behavioral(recent_context)
         elif phase == InterviewPhase.SITUATIONAL:
             skills = ", ".join(candidate_profile.skills[:3]) if candidate_profile.skills else ""
-            prompt = Prompts.interviewer_situational(job_role, skills)
+            system_prompt, prompt = Prompts.interviewer_situational(job_role, skills)
         elif phase == InterviewPhase.CLOSING:
-            prompt = Prompts.interviewer_closing()
+            system_prompt, prompt = Prompts.interviewer_closing()
         else:
-            return "Thank you for participating. The interview is now complete."
-        
-        # Generate question using LLM
-        question, is_valid = self.llm.generate_question(prompt, max_tokens=200)
+            return None
         
+        kind = "greeting" if phase == InterviewPhase.GREETING else "question"
+        return system_prompt, prompt, MAX_TOKENS_BY_KIND[kind]
+    
+    def _finish_question(self, question: str, is_valid: bool, phase: InterviewPhase, difficulty_level: int) -> str:
+        """Return the LLM question, or a fallback if it failed."""
         if not is_valid or not question:
-            logger.warning(f"LLM failed for {phase.value}, using fallback")
+            logger.warning("LLM failed for %s, using fallback", phase.value)
             question = self._get_fallback(phase, difficulty_level)
         else:
-            logger.info(f"LLM generated question: {question[:80]}...")
+            logger.info("LLM generated question: %.80s...", question)
         
         return question
     
     def _get_fallback(self, phase: InterviewPhase, difficulty_level: int) -> str:
         """Get a fallback question for the phase."""
-        phase_key = phase.value
-        
-        if phase_key == "technical":
-            level_questions = FALLBACK_QUESTIONS.get(phase_key, {}).get(
-                difficulty_level, 
-                FALLBACK_QUESTIONS.get(phase_key, {}).get(3, ["Tell me about a technical challenge you faced."])
-            )
-            return random.choice(level_questions)
-        else:
-            questions = FALLBACK_QUESTIONS.get(phase_key, ["Could you tell me more about that?"])
-            return random.choice(questions)
+        return get_fallback(phase.value, difficulty_level)
 
 
 class AnalysisAgent:
@@ -120,8 +195,12 @@ class AnalysisAgent:
     Analyzes candidate answers for quality, relevance, and extracted info.
     """
     
+    # Identical inputs give identical analyses; keep the most recent ones
+    CACHE_SIZE = 1024
+    
     def __init__(self):
         self.llm = llm_client
+        self._cache: "OrderedDict[bytes, AnswerAnalysis]" = OrderedDict()
     
     def analyze_answer(
         self,
@@ -145,6 +224,159 @@ class AnalysisAgent:
         if not answer or len(answer.strip()) < 5:
             return self._get_default_analysis()
         
+        key = self._cache_key(question, answer, phase, job_role)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
+        analysis = self._analyze_uncached(question, answer, phase, job_role)
+        if analysis is not None:
+            self._store_cached(key, analysis)
+            return analysis
+        
+        return self._get_default_analysis()
+    
+    async def aanalyze_answer(
+        self,
+        question: str,
+        answer: str,
+        phase: InterviewPhase,
+        job_role: str
+    ) -> AnswerAnalysis:
+        """Async counterpart of analyze_answer(); the LLM call runs on the event loop."""
+        if not answer or len(answer.strip()) < 5:
+            return self._get_default_analysis()
+        
+        key = self._cache_key(question, answer, phase, job_role)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
+        prompt = Prompts.analyze_answer(
+            job_role=job_role,
+            phase=phase.value,
+            question=question,
+            answer=answer
+        )
+        result, is_valid = await self.llm.agenerate_analysis(prompt, max_tokens=MAX_TOKENS_BY_KIND["analysis"])
+        
+        if is_valid and result:
+            analysis = AnswerScorer.validate_analysis(result)
+            self._store_cached(key, analysis)
+            return analysis
+        
+        return self._get_default_analysis()
+    
+    def analyze_answers_batch(
+        self,
+        items: List[Tuple[str, str, InterviewPhase, str]]
+    ) -> List[AnswerAnalysis]:
+        """
+        Analyze many answers with a single batched submission to the LLM.
+        
+        Args:
+            items: (question, answer, phase, job_role) tuples
+            
+        Returns:
+            One AnswerAnalysis per item, in input order
+        """
+        results, pending = self._prepare_batch(items)
+        if pending:
+            responses = self.llm.generate_analysis_batch(
+                [prompt for _, _, prompt in pending], max_tokens=MAX_TOKENS_BY_KIND["analysis"]
+            )
+            self._finish_batch(results, pending, responses)
+        return results
+    
+    async def aanalyze_answers_batch(
+        self,
+        items: List[Tuple[str, str, InterviewPhase, str]],
+        concurrency: int = 16
+    ) -> List[AnswerAnalysis]:
+        """Async counterpart of analyze_answers_batch(); keeps at most `concurrency` LLM calls in flight."""
+        results, pending = self._prepare_batch(items)
+        if pending:
+            responses = await self.llm.agenerate_analysis_batch(
+                [prompt for _, _, prompt in pending],
+                max_tokens=MAX_TOKENS_BY_KIND["analysis"],
+                concurrency=concurrency
+            )
+            self._finish_batch(results, pending, responses)
+        return results
+    
+    def _prepare_batch(
+        self,
+        items: List[Tuple[str, str, InterviewPhase, str]]
+    ) -> Tuple[List[Optional[AnswerAnalysis]], List[Tuple[int, bytes, str]]]:
+        """Fill results that need no LLM call; return them with the (index, key, prompt) still pending."""
+        results: List[Optional[AnswerAnalysis]] = [None] * len(items)
+        pending: List[Tuple[int, bytes, str]] = []
+        
+        for i, (question, answer, phase, job_role) in enumerate(items):
+            if not answer or len(answer.strip()) < 5:
+                results[i] = self._get_default_analysis()
+                continue
+            
+            key = self._cache_key(question, answer, phase, job_role)
+            cached = self._get_cached(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            
+            prompt = Prompts.analyze_answer(
+                job_role=job_role,
+                phase=phase.value,
+                question=question,
+                answer=answer
+            )
+            pending.append((i, key, prompt))
+        
+        return results, pending
+    
+    def _finish_batch(
+        self,
+        results: List[Optional[AnswerAnalysis]],
+        pending: List[Tuple[int, bytes, str]],
+        responses: List[Tuple[Optional[Dict], bool]]
+    ):
+        """Validate and cache the LLM responses for the pending items."""
+        for (i, key, _), (result, is_valid) in zip(pending, responses):
+            if is_valid and result:
+                analysis = AnswerScorer.validate_analysis(result)
+                self._store_cached(key, analysis)
+                results[i] = analysis
+            else:
+                results[i] = self._get_default_analysis()
+    
+    @staticmethod
+    def _cache_key(question: str, answer: str, phase: InterviewPhase, job_role: str) -> bytes:
+        """Stable digest of everything the analysis depends on."""
+        return hashlib.blake2b(
+            b"|".join([question.encode(), answer.encode(), phase.value.encode(), job_role.encode()]),
+            digest_size=16
+        ).digest()
+    
+    def _get_cached(self, key: bytes) -> Optional[AnswerAnalysis]:
+        """Look up a cached analysis, marking it most recently used."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+        return cached
+    
+    def _store_cached(self, key: bytes, analysis: AnswerAnalysis):
+        """Cache an analysis, evicting the least recently used beyond CACHE_SIZE."""
+        self._cache[key] = analysis
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def _analyze_uncached(
+        self,
+        question: str,
+        answer: str,
+        phase: InterviewPhase,
+        job_role: str
+    ) -> Optional[AnswerAnalysis]:
+        """Run the LLM analysis; None if the LLM gave nothing usable."""
         # Generate analysis prompt
         prompt = Prompts.analyze_answer(
             job_role=job_role,
@@ -154,12 +386,12 @@ class AnalysisAgent:
         )
         
         # Get LLM analysis
-        result, is_valid = self.llm.generate_analysis(prompt, max_tokens=500)
+        result, is_valid = self.llm.generate_analysis(prompt, max_tokens=MAX_TOKENS_BY_KIND["analysis"])
         
         if is_valid and result:
             return AnswerScorer.validate_analysis(result)
         
-        return self._get_default_analysis()
+        return None
     
     def _get_default_analysis(self) -> AnswerAnalysis:
         """Return default analysis when LLM fails."""
@@ -234,7 +466,9 @@ class ReportAgent:
             positive_signs=", ".join(positive_signs[:5]) if positive_signs else "Several positive indicators"
         )
         
-        result, is_valid = self.llm.generate_json(prompt, max_tokens=400)
+        result, is_valid = self.llm.generate_json(
+            prompt, max_tokens=MAX_TOKENS_BY_KIND["report"], json_schema=REPORT_JSON_SCHEMA
+        )
         
         if is_valid and result:
             return result
@@ -263,7 +497,7 @@ class AgentController:
         self.analyzer = AnalysisAgent()
         self.reporter = ReportAgent()
     
-    def process_answer(
+    async def process_answer(
         self,
         session_id: str,
         question: str,
@@ -275,6 +509,12 @@ class AgentController:
         """
         Process a candidate's answer through all relevant agents.
         
+        This is a single LLM round-trip per answer: the analysis response
+        also carries the facts (extracted_info), and the next action is
+        decided by the state machine's rules (should_transition_phase,
+        difficulty from recent scores), so the extract_facts and
+        decide_next_action prompts are never sent here.
+        
         Args:
             session_id: The interview session ID
             question: The question that was asked
@@ -286,24 +526,27 @@ class AgentController:
         Returns:
             Tuple of (AnswerAnalysis, list of stored fact IDs)
         """
-        # Step 1: Analyze the answer
-        analysis = self.analyzer.analyze_answer(
-            question=question,
-            answer=answer,
-            phase=phase,
-            job_role=job_role
+        # Steps 1-2: Analyze the answer and extract rule-based facts concurrently;
+        # the extraction (CPU-bound, so in a worker thread) hides behind the
+        # analysis request awaiting on the event loop.
+        analysis, facts = await asyncio.gather(
+            self.analyzer.aanalyze_answer(
+                question=question,
+                answer=answer,
+                phase=phase,
+                job_role=job_role
+            ),
+            asyncio.to_thread(fact_extractor.extract_facts, phase, question, answer)
         )
         
-        # Step 2: Extract facts
-        facts = fact_extractor.extract_facts(phase, question, answer)
-        
-        # Also extract from analysis results
+        # Also extract from analysis results (needs the analysis, so sequential)
         analysis_facts = fact_extractor.extract_from_analysis(analysis.model_dump())
         facts.extend(analysis_facts)
         
         # Step 3: Store facts in vector DB with embeddings
         fact_dicts = [f.to_dict() for f in facts]
-        fact_ids = rag_pipeline.store_answer_facts(
+        fact_ids = await asyncio.to_thread(
+            rag_pipeline.store_answer_facts,
             session_id=session_id,
             facts=fact_dicts,
             phase=phase
@@ -311,6 +554,29 @@ class AgentController:
         
         return analysis, fact_ids
     
+    def batch_analyze(
+        self,
+        items: List[Tuple[str, str, InterviewPhase, str]]
+    ) -> List[AnswerAnalysis]:
+        """
+        Analyze a batch of answers, e.g. when re-scoring a stored transcript.
+        
+        Args:
+            items: (question, answer, phase, job_role) tuples
+            
+        Returns:
+            One AnswerAnalysis per item, in input order
+        """
+        return self.analyzer.analyze_answers_batch(items)
+    
+    async def abatch_analyze(
+        self,
+        items: List[Tuple[str, str, InterviewPhase, str]],
+        concurrency: int = 16
+    ) -> List[AnswerAnalysis]:
+        """Async counterpart of batch_analyze() for callers on the event loop."""
+        return await self.analyzer.aanalyze_answers_batch(items, concurrency)
+    
     def generate_next_question(
         self,
         session_id: str,
@@ -354,6 +620,68 @@ class AgentController:
             rag_context=rag_context
         )
     
+    async def agenerate_next_question(
+        self,
+        session_id: str,
+        phase: InterviewPhase,
+        job_role: str,
+        candidate_profile: CandidateProfile,
+        covered_topics: List[str],
+        difficulty_level: int,
+        recent_context: str
+    ) -> str:
+        """
+        Async counterpart of generate_next_question().
+        
+        The vector DB lookup runs in a worker thread and the LLM call on the
+        event loop, so other requests keep being served meanwhile.
+        """
+        rag_context = await asyncio.to_thread(
+            rag_pipeline.get_relevant_context_for_question,
+            session_id=session_id,
+            current_phase=phase,
+            current_topic=covered_topics[-1] if covered_topics else None
+        )
+        
+        return await self.interviewer.agenerate_question(
+            phase=phase,
+            job_role=job_role,
+            candidate_profile=candidate_profile,
+            covered_topics=covered_topics,
+            difficulty_level=difficulty_level,
+            recent_context=recent_context,
+            rag_context=rag_context
+        )
+    
+    async def astream_next_question(
+        self,
+        session_id: str,
+        phase: InterviewPhase,
+        job_role: str,
+        candidate_profile: CandidateProfile,
+        covered_topics: List[str],
+        difficulty_level: int,
+        recent_context: str
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of agenerate_next_question(); yields question text as it is decoded."""
+        rag_context = await asyncio.to_thread(
+            rag_pipeline.get_relevant_context_for_question,
+            session_id=session_id,
+            current_phase=phase,
+            current_topic=covered_topics[-1] if covered_topics else None
+        )
+        
+        async for piece in self.interviewer.astream_question(
+            phase=phase,
+            job_role=job_role,
+            candidate_profile=candidate_profile,
+            covered_topics=covered_topics,
+            difficulty_level=difficulty_level,
+            recent_context=recent_context,
+            rag_context=rag_context
+        ):
+            yield piece
+    
     def generate_final_report(
         self,
         job_role: str,
@@ -1,15 +1,16 @@
 """
 Interview phase definitions and transition logic.
 """
+import functools
 from datetime import timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, Optional, Any, Tuple
+from dataclasses import dataclass, field
 
 from models.schemas import InterviewPhase
 from utils.config import config
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PhaseInfo:
     """Information about a single interview phase."""
     phase: InterviewPhase
@@ -17,28 +18,39 @@ class PhaseInfo:
     max_questions: int
     time_limit: timedelta
     description: str
-    focus_areas: List[str]
+    focus_areas: Tuple[str, ...]
+    time_limit_seconds: float = field(init=False)
+    _config: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def get_config(self) -> Dict[str, Any]:
-        """Get phase configuration as dictionary."""
-        return {
+    def __post_init__(self):
+        # Frozen instance: derived fields are set once through object.__setattr__
+        time_limit_seconds = self.time_limit.total_seconds()
+        object.__setattr__(self, "time_limit_seconds", time_limit_seconds)
+        object.__setattr__(self, "_config", {
             "min_questions": self.min_questions,
             "max_questions": self.max_questions,
-            "time_limit_minutes": self.time_limit.total_seconds() / 60,
+            "time_limit_minutes": time_limit_seconds / 60,
             "description": self.description,
             "focus_areas": self.focus_areas
-        }
+        })
+    
+    def get_config(self) -> Dict[str, Any]:
+        """Get phase configuration as dictionary (built once; treat as read-only)."""
+        return self._config
 
 
 # Phase order for progression
-PHASE_ORDER = [
+PHASE_ORDER = (
     InterviewPhase.GREETING,
     InterviewPhase.INTRODUCTION,
     InterviewPhase.TECHNICAL,
     InterviewPhase.BEHAVIORAL,
     InterviewPhase.SITUATIONAL,
     InterviewPhase.CLOSING,
-]
+)
+
+# Position of each phase in PHASE_ORDER, for O(1) neighbour lookups
+_PHASE_INDEX: Dict[InterviewPhase, int] = {phase: i for i, phase in enumerate(PHASE_ORDER)}
 
 
 class InterviewPhases:
@@ -54,7 +66,7 @@ class InterviewPhases:
             max_questions=2,
             time_limit=timedelta(minutes=2),
             description="Initial greeting and introduction",
-            focus_areas=["welcome", "rapport building"]
+            focus_areas=("welcome", "rapport building")
         ),
         InterviewPhase.INTRODUCTION: PhaseInfo(
             phase=InterviewPhase.INTRODUCTION,
@@ -62,7 +74,7 @@ class InterviewPhases:
             max_questions=5,
             time_limit=timedelta(minutes=5),
             description="Understanding candidate background",
-            focus_areas=["background", "motivation", "career goals", "experience overview"]
+            focus_areas=("background", "motivation", "career goals", "experience overview")
         ),
         InterviewPhase.TECHNICAL: PhaseInfo(
             phase=InterviewPhase.TECHNICAL,
@@ -70,7 +82,7 @@ class InterviewPhases:
             max_questions=10,
             time_limit=timedelta(minutes=20),
             description="Technical knowledge assessment",
-            focus_areas=["coding", "architecture", "problem-solving", "tools", "best practices"]
+            focus_areas=("coding", "architecture", "problem-solving", "tools", "best practices")
         ),
         InterviewPhase.BEHAVIORAL: PhaseInfo(
             phase=InterviewPhase.BEHAVIORAL,
@@ -78,7 +90,7 @@ class InterviewPhases:
             max_questions=6,
             time_limit=timedelta(minutes=10),
             description="Past behavior and experiences",
-            focus_areas=["teamwork", "conflict resolution", "leadership", "challenges"]
+            focus_areas=("teamwork", "conflict resolution", "leadership", "challenges")
         ),
         InterviewPhase.SITUATIONAL: PhaseInfo(
             phase=InterviewPhase.SITUATIONAL,
@@ -86,7 +98,7 @@ class InterviewPhases:
             max_questions=4,
             time_limit=timedelta(minutes=8),
             description="Hypothetical scenario handling",
-            focus_areas=["decision-making", "judgment", "priorities", "problem-solving approach"]
+            focus_areas=("decision-making", "judgment", "priorities", "problem-solving approach")
         ),
         InterviewPhase.CLOSING: PhaseInfo(
             phase=InterviewPhase.CLOSING,
@@ -94,7 +106,7 @@ class InterviewPhases:
             max_questions=3,
             time_limit=timedelta(minutes=3),
             description="Wrapping up the interview",
-            focus_areas=["questions", "next steps", "closing remarks"]
+            focus_areas=("questions", "next steps", "closing remarks")
         ),
     }
     
@@ -114,24 +126,20 @@ class InterviewPhases:
         Returns:
             The next phase, or None if at the end
         """
-        try:
-            idx = PHASE_ORDER.index(current)
-            if idx < len(PHASE_ORDER) - 1:
-                return PHASE_ORDER[idx + 1]
-            return InterviewPhase.ENDED
-        except ValueError:
+        idx = _PHASE_INDEX.get(current)
+        if idx is None:
             return None
+        if idx < len(PHASE_ORDER) - 1:
+            return PHASE_ORDER[idx + 1]
+        return InterviewPhase.ENDED
     
     @classmethod
     def get_previous_phase(cls, current: InterviewPhase) -> Optional[InterviewPhase]:
         """Get the previous phase."""
-        try:
-            idx = PHASE_ORDER.index(current)
-            if idx > 0:
-                return PHASE_ORDER[idx - 1]
-            return None
-        except ValueError:
-            return None
+        idx = _PHASE_INDEX.get(current)
+        if idx:
+            return PHASE_ORDER[idx - 1]
+        return None
     
     @classmethod
     def should_transition(
@@ -197,7 +205,8 @@ class InterviewPhases:
             return {}
         
         question_progress = questions_asked / info.max_questions
-        time_progress = time_elapsed.total_seconds() / info.time_limit.total_seconds()
+        elapsed_seconds = time_elapsed.total_seconds()
+        time_progress = elapsed_seconds / info.time_limit_seconds
         
         return {
             "phase": phase.value,
@@ -205,20 +214,21 @@ class InterviewPhases:
             "min_questions": info.min_questions,
             "max_questions": info.max_questions,
             "question_progress": min(question_progress, 1.0),
-            "time_elapsed_minutes": time_elapsed.total_seconds() / 60,
-            "time_limit_minutes": info.time_limit.total_seconds() / 60,
+            "time_elapsed_minutes": elapsed_seconds / 60,
+            "time_limit_minutes": info.time_limit_seconds / 60,
             "time_progress": min(time_progress, 1.0),
             "can_transition": questions_asked >= info.min_questions,
             "must_transition": questions_asked >= info.max_questions or time_progress >= 1.0
         }
     
     @classmethod
-    def get_all_phases_info(cls) -> List[Dict[str, Any]]:
-        """Get information about all phases."""
-        return [
+    @functools.cache
+    def get_all_phases_info(cls) -> Tuple[Dict[str, Any], ...]:
+        """Get information about all phases (PHASES is constant, so built once)."""
+        return tuple(
             {
                 "phase": phase.value,
                 **cls.PHASES[phase].get_config()
             }
             for phase in PHASE_ORDER
-        ]
+        )
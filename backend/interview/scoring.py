@@ -2,14 +2,104 @@
 Answer scoring and evaluation system.
 Provides consistent scoring across all interview phases.
 """
-from typing import Dict, Any, List, Optional
+import bisect
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
 from models.schemas import AnswerAnalysis, InterviewPhase
 from utils.config import config
 
+import numpy as np
 
-@dataclass
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Below this many analyses, staging into an array costs more than it saves
+NUMBA_MIN_ANALYSES = 256
+
+SCORE_FIELDS = ("quality", "relevance", "completeness", "technical_depth", "communication")
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _mean_cols(a):
+        """Column means of a 2-D score array."""
+        n, m = a.shape
+        out = np.zeros(m, dtype=np.float64)
+        for i in range(n):
+            for j in range(m):
+                out[j] += a[i, j]
+        return out / n
+    
+    # Compile at import so the first report doesn't pay for it
+    _mean_cols(np.zeros((1, len(SCORE_FIELDS)), dtype=np.float32))
+
+
+def _to_score_int(value) -> int:
+    """Coerce a raw score to int, pre-clipped so huge values can't overflow int8."""
+    try:
+        return max(-128, min(127, int(value)))
+    except (TypeError, ValueError):
+        return 5  # Default to middle score
+
+
+def scores_to_array(analyses: List[AnswerAnalysis]) -> "np.ndarray":
+    """
+    Stage analysis scores into an (N, 5) float32 array.
+    
+    Columns follow SCORE_FIELDS: quality, relevance, completeness,
+    technical_depth, communication_quality.
+    """
+    arr = np.empty((len(analyses), len(SCORE_FIELDS)), dtype=np.float32)
+    for i, a in enumerate(analyses):
+        arr[i, 0] = a.quality_score
+        arr[i, 1] = a.relevance_score
+        arr[i, 2] = a.completeness_score
+        arr[i, 3] = a.technical_depth
+        arr[i, 4] = a.communication_quality
+    return arr
+
+
+def _normalize_weights(weights: Dict[str, float]) -> Tuple[float, ...]:
+    """
+    Fold weight-sum normalization and the x10 scale into per-field factors.
+    
+    Returns:
+        Factors in SCORE_FIELDS order
+    """
+    total = sum(weights.values())
+    return tuple(weights[field] / total * 10 for field in SCORE_FIELDS)
+
+
+def _make_scorer(factors: Tuple[float, ...]) -> Callable[[AnswerAnalysis], float]:
+    """
+    Build a weighted scorer with one phase's factors bound in.
+    
+    Args:
+        factors: Normalized weights in SCORE_FIELDS order
+        
+    Returns:
+        Function mapping an analysis to its rounded weighted score
+    """
+    wq, wr, wc, wt, wcm = factors
+    
+    def score(a: AnswerAnalysis) -> float:
+        return round(
+            a.quality_score * wq +
+            a.relevance_score * wr +
+            a.completeness_score * wc +
+            a.technical_depth * wt +
+            a.communication_quality * wcm,
+            1
+        )
+    
+    return score
+
+
+@dataclass(frozen=True, slots=True)
 class ScoreBreakdown:
     """Detailed score breakdown for an answer."""
     quality: int
@@ -73,6 +163,34 @@ class AnswerScorer:
         },
     }
     
+    # PHASE_WEIGHTS pre-normalized into SCORE_FIELDS-ordered tuples
+    _NORMALIZED_WEIGHTS: Dict[InterviewPhase, Tuple[float, ...]] = {
+        phase: _normalize_weights(weights) for phase, weights in PHASE_WEIGHTS.items()
+    }
+    
+    # Same factors as column vectors for scoring a whole (N, 5) score array at once
+    _WEIGHT_VECTORS: Dict[InterviewPhase, "np.ndarray"] = {
+        phase: np.array(factors, dtype=np.float64) for phase, factors in _NORMALIZED_WEIGHTS.items()
+    }
+    
+    # One scorer per phase with its weights bound as constants
+    _SCORERS: Dict[InterviewPhase, Callable[[AnswerAnalysis], float]] = {
+        phase: _make_scorer(factors) for phase, factors in _NORMALIZED_WEIGHTS.items()
+    }
+    
+    # Fallbacks for phases without weights, resolved once instead of per call
+    _DEFAULT_SCORER = _SCORERS[InterviewPhase.INTRODUCTION]
+    _DEFAULT_WEIGHT_VECTOR = _WEIGHT_VECTORS[InterviewPhase.INTRODUCTION]
+    
+    # Raw analysis keys and their defaults, in validate_analysis unpacking order
+    SCORE_KEYS = (
+        ("quality_score", 5),
+        ("relevance_score", 5),
+        ("completeness_score", 5),
+        ("technical_depth", 3),
+        ("communication_quality", 5),
+    )
+    
     # Score interpretation thresholds
     INTERPRETATIONS = {
         (0, 3): "Poor - Significant improvement needed",
@@ -83,6 +201,11 @@ class AnswerScorer:
         (9, 10.1): "Excellent - Outstanding performance",
     }
     
+    # Sorted band upper bounds and labels for a binary search over INTERPRETATIONS
+    _INTERP_UPPER = tuple(high for (_, high) in INTERPRETATIONS)
+    _INTERP_LABELS = tuple(INTERPRETATIONS.values())
+    _INTERP_MIN = min(low for (low, _) in INTERPRETATIONS)
+    
     @classmethod
     def calculate_weighted_score(
         cls,
@@ -99,27 +222,15 @@ class AnswerScorer:
         Returns:
             Weighted score from 0-10
         """
-        weights = cls.PHASE_WEIGHTS.get(phase, cls.PHASE_WEIGHTS[InterviewPhase.INTRODUCTION])
-        
-        score = (
-            analysis.quality_score * weights["quality"] +
-            analysis.relevance_score * weights["relevance"] +
-            analysis.completeness_score * weights["completeness"] +
-            analysis.technical_depth * weights["technical_depth"] +
-            analysis.communication_quality * weights["communication"]
-        )
-        
-        # Normalize to handle any weight sum variations
-        weight_sum = sum(weights.values())
-        return round(score / weight_sum * 10, 1) if weight_sum > 0 else 5.0
+        return cls._SCORERS.get(phase, cls._DEFAULT_SCORER)(analysis)
     
     @classmethod
     def get_score_interpretation(cls, score: float) -> str:
         """Get human-readable interpretation of a score."""
-        for (low, high), interpretation in cls.INTERPRETATIONS.items():
-            if low <= score < high:
-                return interpretation
-        return "Score out of range"
+        idx = bisect.bisect_right(cls._INTERP_UPPER, score)
+        if score < cls._INTERP_MIN or idx >= len(cls._INTERP_LABELS):
+            return "Score out of range"
+        return cls._INTERP_LABELS[idx]
     
     @classmethod
     def get_score_breakdown(
@@ -176,18 +287,26 @@ class AnswerScorer:
                 "answer_count": 0,
             }
         
-        n = len(analyses)
+        # One pass to stage the scores, then C-level reductions over the columns
+        arr = scores_to_array(analyses)
+        weights = cls._WEIGHT_VECTORS.get(phase, cls._DEFAULT_WEIGHT_VECTOR)
+        stats = np.empty(len(SCORE_FIELDS) + 1, dtype=np.float64)
+        arr.mean(axis=0, dtype=np.float64, out=stats[:-1])
+        stats[-1] = (arr @ weights).mean()
+        
+        # Round once, at the output boundary
+        quality, relevance, completeness, technical_depth, communication, weighted = (
+            stats.round(1).tolist()
+        )
         
         return {
-            "avg_quality": round(sum(a.quality_score for a in analyses) / n, 1),
-            "avg_relevance": round(sum(a.relevance_score for a in analyses) / n, 1),
-            "avg_completeness": round(sum(a.completeness_score for a in analyses) / n, 1),
-            "avg_technical_depth": round(sum(a.technical_depth for a in analyses) / n, 1),
-            "avg_communication": round(sum(a.communication_quality for a in analyses) / n, 1),
-            "weighted_average": round(
-                sum(cls.calculate_weighted_score(a, phase) for a in analyses) / n, 1
-            ),
-            "answer_count": n,
+            "avg_quality": quality,
+            "avg_relevance": relevance,
+            "avg_completeness": completeness,
+            "avg_technical_depth": technical_depth,
+            "avg_communication": communication,
+            "weighted_average": weighted,
+            "answer_count": len(analyses),
         }
     
     @classmethod
@@ -213,15 +332,15 @@ class AnswerScorer:
                 "communication": 0,
             }
         
-        n = len(all_analyses)
+        arr = scores_to_array(all_analyses)
         
-        return {
-            "quality": round(sum(a.quality_score for a in all_analyses) / n, 1),
-            "relevance": round(sum(a.relevance_score for a in all_analyses) / n, 1),
-            "completeness": round(sum(a.completeness_score for a in all_analyses) / n, 1),
-            "technical_depth": round(sum(a.technical_depth for a in all_analyses) / n, 1),
-            "communication": round(sum(a.communication_quality for a in all_analyses) / n, 1),
-        }
+        # Large offline/batch regenerations go through the JIT reducer
+        if NUMBA_AVAILABLE and len(all_analyses) >= NUMBA_MIN_ANALYSES:
+            means = _mean_cols(arr)
+        else:
+            means = arr.mean(axis=0, dtype=np.float64)
+        
+        return dict(zip(SCORE_FIELDS, np.round(means, 1).tolist()))
     
     @classmethod
     def get_recommendation(cls, overall_weighted: float) -> str:
@@ -255,18 +374,20 @@ class AnswerScorer:
         Returns:
             Validated AnswerAnalysis
         """
-        def clamp(value, min_val=1, max_val=10):
-            try:
-                return max(min_val, min(max_val, int(value)))
-            except (TypeError, ValueError):
-                return 5  # Default to middle score
+        # Clamp all five scores to 1-10 in one vectorized call
+        scores = np.array(
+            [_to_score_int(analysis_dict.get(key, default)) for key, default in cls.SCORE_KEYS],
+            dtype=np.int8
+        )
+        np.clip(scores, 1, 10, out=scores)
+        quality, relevance, completeness, technical_depth, communication = scores.tolist()
         
         return AnswerAnalysis(
-            quality_score=clamp(analysis_dict.get("quality_score", 5)),
-            relevance_score=clamp(analysis_dict.get("relevance_score", 5)),
-            completeness_score=clamp(analysis_dict.get("completeness_score", 5)),
-            technical_depth=clamp(analysis_dict.get("technical_depth", 3)),
-            communication_quality=clamp(analysis_dict.get("communication_quality", 5)),
+            quality_score=quality,
+            relevance_score=relevance,
+            completeness_score=completeness,
+            technical_depth=technical_depth,
+            communication_quality=communication,
             extracted_info=analysis_dict.get("extracted_info", {}),
             suggested_follow_ups=analysis_dict.get("suggested_follow_ups", []),
             areas_to_probe=analysis_dict.get("areas_to_probe", []),
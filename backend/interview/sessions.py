@@ -0,0 +1,130 @@
+"""
+Interview session storage.
+
+Sessions live in Redis when REDIS_URL is configured, so every uvicorn worker
+(and a restarted process) sees the same interviews; otherwise they are kept
+in this process's memory.
+"""
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from cachetools import TTLCache
+
+from interview.state import InterviewStateMachine
+from utils.locks import KeyedLocks
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import LockError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    Interview sessions by ID, expiring after ttl_seconds without a save.
+    
+    Requests that modify a session hold lock(session_id) from get to save,
+    so overlapping requests for the same interview run one after another
+    instead of overwriting each other's changes.
+    """
+    
+    KEY_PREFIX = "interview:session:"
+    LOCK_PREFIX = "interview:lock:"
+    
+    def __init__(
+        self,
+        redis_url: str = "",
+        ttl_seconds: int = 86400,
+        maxsize: int = 1024,
+        lock_timeout_seconds: float = 120.0
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._redis = None
+        if redis_url:
+            if REDIS_AVAILABLE:
+                self._redis = aioredis.from_url(redis_url)
+            else:
+                logger.warning("REDIS_URL is set but redis is not installed; keeping sessions in memory")
+        
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._locks = KeyedLocks()
+    
+    async def get(self, session_id: str) -> Optional[InterviewStateMachine]:
+        """
+        Load a session.
+        
+        Args:
+            session_id: Session to load
+            
+        Returns:
+            The session, or None if it doesn't exist or has expired
+        """
+        if self._redis is None:
+            return self._local.get(session_id)
+        
+        data = await self._redis.get(self.KEY_PREFIX + session_id)
+        return InterviewStateMachine.from_bytes(data) if data is not None else None
+    
+    async def create(self, session: InterviewStateMachine):
+        """Store a new session."""
+        await self.save(session)
+    
+    async def save(self, session: InterviewStateMachine):
+        """Persist a session after it has changed, refreshing its TTL."""
+        if self._redis is None:
+            # Callers mutate the stored object itself; re-inserting refreshes its TTL
+            self._local[session.session_id] = session
+            return
+        await self._redis.set(self.KEY_PREFIX + session.session_id, session.to_bytes(), ex=self.ttl_seconds)
+    
+    async def delete(self, session_id: str):
+        """Remove a session."""
+        if self._redis is None:
+            self._local.pop(session_id, None)
+            return
+        await self._redis.delete(self.KEY_PREFIX + session_id)
+    
+    @asynccontextmanager
+    async def lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Hold a session exclusively.
+        
+        The in-process lock queues this worker's requests; with Redis a
+        SET NX lock (expiring after lock_timeout_seconds, in case a worker
+        dies holding it) also excludes the other workers.
+        
+        Raises:
+            TimeoutError: If another worker held the session for longer
+                than lock_timeout_seconds
+        """
+        async with self._locks.get(session_id):
+            if self._redis is None:
+                yield
+                return
+            
+            shared = self._redis.lock(
+                self.LOCK_PREFIX + session_id,
+                timeout=self.lock_timeout_seconds,
+                blocking_timeout=self.lock_timeout_seconds
+            )
+            if not await shared.acquire():
+                raise TimeoutError(f"Session {session_id} is busy")
+            try:
+                yield
+            finally:
+                try:
+                    await shared.release()
+                except LockError:
+                    # Expired while held; another worker may have taken over
+                    logger.warning("Session lock for %s expired before release", session_id)
+    
+    async def close(self):
+        """Close the Redis connection pool, if any."""
+        if self._redis is not None:
+            await self._redis.aclose()
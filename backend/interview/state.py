@@ -2,9 +2,13 @@
 Interview state machine for managing interview flow.
 Tracks conversation, phases, and candidate profile.
 """
+import heapq
+import pickle
+import time
 import uuid
+from collections import Counter, deque
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set
 
 from models.schemas import (
     InterviewPhase,
@@ -19,12 +23,32 @@ from interview.phases import InterviewPhases, PHASE_ORDER
 from utils.config import config
 
 
+# Inferred experience level -> (apply while current years below this, years to set).
+# A None threshold means only fill in when no experience is known yet.
+_EXP_LEVEL_TABLE = {
+    "senior": (5, 8),
+    "mid": (3, 4),
+    "junior": (None, 1),
+}
+
+
 class InterviewStateMachine:
     """
     Manages the state of an interview session.
     Handles phase transitions, conversation history, and candidate profile.
     """
     
+    # Fixed attribute set: smaller instances and faster attribute access
+    __slots__ = (
+        "session_id", "job_role", "phase", "phase_start_time", "_phase_start_monotonic",
+        "start_time", "end_time",
+        "questions_asked", "answers_received", "_context_lines",
+        "_phase_question_counts", "_recent_scores", "candidate_profile",
+        "_skills_set", "_technologies_set", "current_topic", "difficulty_level",
+        "focus_areas", "red_flags", "positive_signs", "_red_flags_set",
+        "_positive_signs_set", "covered_topics", "_covered_topics_set", "_profile_summary",
+    )
+    
     def __init__(self, job_role: str = "Software Engineer", session_id: Optional[str] = None):
         """
         Initialize a new interview state machine.
@@ -38,7 +62,8 @@ class InterviewStateMachine:
         
         # Phase tracking
         self.phase = InterviewPhase.GREETING
-        self.phase_start_time = datetime.now()
+        self.phase_start_time = datetime.now()  # For display
+        self._phase_start_monotonic = time.monotonic()  # For elapsed-time checks
         
         # Timing
         self.start_time = datetime.now()
@@ -47,10 +72,18 @@ class InterviewStateMachine:
         # Conversation tracking
         self.questions_asked: List[QuestionRecord] = []
         self.answers_received: List[AnswerRecord] = []
-        self.conversation_history: List[ConversationTurn] = []
+        # conversation_history is derived from the two record lists on demand
+        # "Role: preview" line per turn, formatted once when the turn is recorded
+        self._context_lines: List[str] = []
+        self._phase_question_counts: Counter = Counter()
+        # Average scores of the last few answers, for adaptive transitions
+        self._recent_scores: deque = deque(maxlen=3)
         
         # Candidate state
         self.candidate_profile = CandidateProfile()
+        # Membership mirrors of the ordered profile lists
+        self._skills_set: Set[str] = set()
+        self._technologies_set: Set[str] = set()
         self.current_topic: Optional[str] = None
         self.difficulty_level: int = 3  # 1-5 scale
         
@@ -58,9 +91,16 @@ class InterviewStateMachine:
         self.focus_areas: List[str] = []
         self.red_flags: List[str] = []
         self.positive_signs: List[str] = []
+        # Kept deduplicated as they arrive, in first-seen order
+        self._red_flags_set: Set[str] = set()
+        self._positive_signs_set: Set[str] = set()
         
         # Topic tracking (to avoid duplicates)
         self.covered_topics: List[str] = []
+        self._covered_topics_set: Set[str] = set()
+        
+        # Cached get_profile_summary() result; reset whenever the profile changes
+        self._profile_summary: Optional[str] = None
     
     # ========================================
     # Conversation Management
@@ -77,26 +117,22 @@ class InterviewStateMachine:
         Returns:
             The created question record
         """
+        now = datetime.now()
         record = QuestionRecord(
             question=question,
             phase=self.phase,
             topic=topic or self.current_topic,
             difficulty_level=self.difficulty_level,
-            timestamp=datetime.now()
+            timestamp=now
         )
         self.questions_asked.append(record)
+        self._phase_question_counts[self.phase] += 1
         
-        # Add to conversation history
-        self.conversation_history.append(ConversationTurn(
-            role="interviewer",
-            content=question,
-            phase=self.phase,
-            timestamp=datetime.now(),
-            metadata={"topic": topic, "difficulty": self.difficulty_level}
-        ))
+        self._context_lines.append(f"Interviewer: {self._preview(question)}")
         
         # Track topic
-        if topic and topic not in self.covered_topics:
+        if topic and topic not in self._covered_topics_set:
+            self._covered_topics_set.add(topic)
             self.covered_topics.append(topic)
         
         return record
@@ -117,29 +153,18 @@ class InterviewStateMachine:
         if self.questions_asked:
             question_ref = self.questions_asked[-1].question[:50]
         
+        now = datetime.now()
         record = AnswerRecord(
             answer=answer,
             analysis=analysis,
             phase=self.phase,
             question_ref=question_ref,
-            timestamp=datetime.now()
+            timestamp=now
         )
         self.answers_received.append(record)
+        self._recent_scores.append(analysis.average_score)
         
-        # Add to conversation history
-        self.conversation_history.append(ConversationTurn(
-            role="candidate",
-            content=answer,
-            phase=self.phase,
-            timestamp=datetime.now(),
-            metadata={
-                "scores": {
-                    "quality": analysis.quality_score,
-                    "relevance": analysis.relevance_score,
-                    "completeness": analysis.completeness_score
-                }
-            }
-        ))
+        self._context_lines.append(f"Candidate: {self._preview(answer)}")
         
         return record
     
@@ -155,23 +180,79 @@ class InterviewStateMachine:
             return self.answers_received[-1].answer
         return None
     
+    @staticmethod
+    def _question_turn(record: QuestionRecord) -> ConversationTurn:
+        """Build the interviewer turn for a question record."""
+        return ConversationTurn(
+            role="interviewer",
+            content=record.question,
+            phase=record.phase,
+            timestamp=record.timestamp,
+            metadata={"topic": record.topic, "difficulty": record.difficulty_level}
+        )
+    
+    @staticmethod
+    def _answer_turn(record: AnswerRecord) -> ConversationTurn:
+        """Build the candidate turn for an answer record."""
+        analysis = record.analysis
+        return ConversationTurn(
+            role="candidate",
+            content=record.answer,
+            phase=record.phase,
+            timestamp=record.timestamp,
+            metadata={
+                "scores": {
+                    "quality": analysis.quality_score,
+                    "relevance": analysis.relevance_score,
+                    "completeness": analysis.completeness_score
+                }
+            }
+        )
+    
+    def _merge_turns(
+        self,
+        questions: Iterable[QuestionRecord],
+        answers: Iterable[AnswerRecord]
+    ) -> Iterator[ConversationTurn]:
+        """Interleave question and answer records into turns by timestamp."""
+        # Both lists are appended in time order; on ties the question comes first
+        return heapq.merge(
+            map(self._question_turn, questions),
+            map(self._answer_turn, answers),
+            key=lambda turn: turn.timestamp
+        )
+    
+    def iter_conversation(self) -> Iterator[ConversationTurn]:
+        """Iterate over the full conversation in order, building turns lazily."""
+        return self._merge_turns(self.questions_asked, self.answers_received)
+    
+    @property
+    def conversation_history(self) -> List[ConversationTurn]:
+        """The full conversation as a list of turns."""
+        return list(self.iter_conversation())
+    
     def get_recent_context(self, num_turns: int = 5) -> List[ConversationTurn]:
         """Get the most recent conversation turns for short-term memory."""
-        return self.conversation_history[-num_turns:]
+        if num_turns <= 0:
+            return []
+        # The last n turns are drawn from at most the last n records of each list
+        recent = list(self._merge_turns(
+            self.questions_asked[-num_turns:],
+            self.answers_received[-num_turns:]
+        ))
+        return recent[-num_turns:]
     
     def get_context_string(self, num_turns: int = 3) -> str:
         """Get recent context as a formatted string for prompts."""
-        recent = self.get_recent_context(num_turns)
-        if not recent:
+        if not self._context_lines:
             return "No conversation yet."
         
-        lines = []
-        for turn in recent:
-            role = "Interviewer" if turn.role == "interviewer" else "Candidate"
-            content = turn.content[:150] + "..." if len(turn.content) > 150 else turn.content
-            lines.append(f"{role}: {content}")
-        
-        return "\n".join(lines)
+        return "\n".join(self._context_lines[-num_turns:])
+    
+    @staticmethod
+    def _preview(content: str, limit: int = 150) -> str:
+        """Truncate turn content for prompt context."""
+        return content[:limit] + "..." if len(content) > limit else content
     
     # ========================================
     # Phase Management
@@ -179,12 +260,11 @@ class InterviewStateMachine:
     
     def get_phase_question_count(self, phase: Optional[InterviewPhase] = None) -> int:
         """Count questions asked in a specific phase."""
-        target = phase or self.phase
-        return sum(1 for q in self.questions_asked if q.phase == target)
+        return self._phase_question_counts[phase or self.phase]
     
     def get_phase_time_elapsed(self) -> timedelta:
         """Get time elapsed in current phase."""
-        return datetime.now() - self.phase_start_time
+        return timedelta(seconds=time.monotonic() - self._phase_start_monotonic)
     
     def should_transition_phase(self) -> bool:
         """Check if we should transition to the next phase."""
@@ -192,7 +272,7 @@ class InterviewStateMachine:
             return False
         
         # Get average recent score for adaptive transition
-        recent_scores = [a.analysis.average_score for a in self.answers_received[-3:]]
+        recent_scores = self._recent_scores
         avg_score = sum(recent_scores) / len(recent_scores) if recent_scores else None
         
         return InterviewPhases.should_transition(
@@ -218,6 +298,7 @@ class InterviewStateMachine:
         
         self.phase = next_phase
         self.phase_start_time = datetime.now()
+        self._phase_start_monotonic = time.monotonic()
         self.current_topic = None
         
         return True
@@ -239,25 +320,31 @@ class InterviewStateMachine:
             analysis: The answer analysis to incorporate
         """
         extracted = analysis.extracted_info
+        self._profile_summary = None
         
         # Update skills
         for skill in extracted.get("skills", []):
-            if skill and skill not in self.candidate_profile.skills:
+            if skill and skill not in self._skills_set:
+                self._skills_set.add(skill)
                 self.candidate_profile.skills.append(skill)
         
         # Update technologies
         for tech in extracted.get("technologies", []):
-            if tech and tech not in self.candidate_profile.technologies:
+            if tech and tech not in self._technologies_set:
+                self._technologies_set.add(tech)
                 self.candidate_profile.technologies.append(tech)
         
         # Update experience level inference
-        exp_level = extracted.get("experience_level", "")
-        if exp_level == "senior" and (self.candidate_profile.experience_years or 0) < 5:
-            self.candidate_profile.experience_years = 8
-        elif exp_level == "mid" and (self.candidate_profile.experience_years or 0) < 3:
-            self.candidate_profile.experience_years = 4
-        elif exp_level == "junior" and self.candidate_profile.experience_years is None:
-            self.candidate_profile.experience_years = 1
+        entry = _EXP_LEVEL_TABLE.get(extracted.get("experience_level", ""))
+        if entry:
+            threshold, years = entry
+            current = self.candidate_profile.experience_years
+            if threshold is None:
+                should_update = current is None
+            else:
+                should_update = (current or 0) < threshold
+            if should_update:
+                self.candidate_profile.experience_years = years
         
         # Update communication style
         if analysis.communication_quality >= 7:
@@ -273,18 +360,25 @@ class InterviewStateMachine:
             self.candidate_profile.confidence_level = 2
         
         # Collect red flags and positive signs
-        self.red_flags.extend(analysis.red_flags)
-        self.positive_signs.extend(analysis.positive_signs)
+        for flag in analysis.red_flags:
+            if flag not in self._red_flags_set:
+                self._red_flags_set.add(flag)
+                self.red_flags.append(flag)
+        for sign in analysis.positive_signs:
+            if sign not in self._positive_signs_set:
+                self._positive_signs_set.add(sign)
+                self.positive_signs.append(sign)
         
         # Adjust difficulty based on performance
         avg_score = analysis.average_score
-        if avg_score >= 8:
-            self.difficulty_level = min(5, self.difficulty_level + 1)
-        elif avg_score <= 4:
-            self.difficulty_level = max(1, self.difficulty_level - 1)
+        delta = (avg_score >= 8) - (avg_score <= 4)  # +1 strong, -1 weak, 0 otherwise
+        self.difficulty_level = max(1, min(5, self.difficulty_level + delta))
     
     def get_profile_summary(self) -> str:
         """Get a summary of the candidate profile for prompts."""
+        if self._profile_summary is not None:
+            return self._profile_summary
+        
         parts = []
         
         if self.candidate_profile.skills:
@@ -299,14 +393,21 @@ class InterviewStateMachine:
         if self.candidate_profile.communication_style:
             parts.append(f"Communication: {self.candidate_profile.communication_style}")
         
-        return "; ".join(parts) if parts else "No profile data yet."
+        self._profile_summary = "; ".join(parts) if parts else "No profile data yet."
+        return self._profile_summary
     
     # ========================================
     # Serialization
     # ========================================
     
-    def to_session(self) -> InterviewSession:
-        """Convert state machine to InterviewSession model."""
+    def to_session(self, include_history: bool = False) -> InterviewSession:
+        """
+        Convert state machine to InterviewSession model.
+        
+        Args:
+            include_history: Also materialize conversation_history. The turns
+                duplicate questions_asked/answers_received, so it is off by default.
+        """
         return InterviewSession(
             session_id=self.session_id,
             job_role=self.job_role,
@@ -316,16 +417,28 @@ class InterviewStateMachine:
             phase_start_time=self.phase_start_time,
             questions_asked=self.questions_asked,
             answers_received=self.answers_received,
-            conversation_history=self.conversation_history,
+            conversation_history=self.conversation_history if include_history else [],
             candidate_profile=self.candidate_profile,
             current_topic=self.current_topic,
             difficulty_level=self.difficulty_level,
             focus_areas=self.focus_areas,
-            red_flags=list(set(self.red_flags)),  # Deduplicate
-            positive_signs=list(set(self.positive_signs)),
+            red_flags=self.red_flags,  # Already deduplicated
+            positive_signs=self.positive_signs,
             covered_topics=self.covered_topics,
         )
     
+    def to_bytes(self) -> bytes:
+        """Serialize the full state, e.g. for an external session store."""
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InterviewStateMachine":
+        """Restore a state serialized by to_bytes() (only from a trusted store)."""
+        state = pickle.loads(data)
+        if not isinstance(state, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(state).__name__}")
+        return state
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current interview status."""
         phase_progress = InterviewPhases.get_phase_progress(
@@ -1,3 +1,12 @@
-# LLM module - using OpenRouter API
-from .client import GeminiClient, llm_client, LLMClient
+# LLM module - OpenRouter or local llama.cpp backend
+from .client import (
+    BaseLLMClient,
+    OpenRouterClient,
+    LlamaCppClient,
+    make_client,
+    GeminiClient,
+    llm_client,
+    LLMClient,
+    MAX_TOKENS_BY_KIND,
+)
 from .prompts import Prompts
@@ -1,22 +1,107 @@
 """
-LLM Client using OpenRouter API.
-OpenRouter provides unified access to many models including Claude, GPT-4, Gemini, etc.
+LLM clients for the interviewer.
 
-Set OPENROUTER_API_KEY environment variable or pass directly.
+Two backends share one interface:
+- OpenRouter: unified access to hosted models (Claude, GPT-4, Gemini, etc.).
+  Set OPENROUTER_API_KEY environment variable or pass directly.
+- llama.cpp: a local llama-server at LLM_URL.
+
+LLM_BACKEND ("openrouter" or "llamacpp") picks which one llm_client uses.
 """
 import os
+import re
+import abc
 import json
+import time
+import random
+import asyncio
+import hashlib
 import logging
-import re
-from typing import Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from llm.prompts import ANALYSIS_JSON_SCHEMA
+from utils.cleaning import ResponseCleaner
+from utils.config import config
+
+try:
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Transient failures worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+TRANSIENT_ERRORS = (
+    httpx.TransportError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+)
+if AIOHTTP_AVAILABLE:
+    TRANSIENT_ERRORS += (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+# Async requests in flight per client; the rest wait instead of piling onto the pool
+ASYNC_CONCURRENCY = config.llm.max_concurrency
+
+# A streamed question is complete at its first "?" (plus any closing quote)
+# once whitespace follows it; only the end of the stream can stand in for that
+QUESTION_MARK_RE = re.compile(r"\?[\"'\u201d\u2019)]*(?=\s)")
+QUESTION_MARK_FINAL_RE = re.compile(r"\?[\"'\u201d\u2019)]*(?=\s|$)")
+PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*\n")
+
+# Token budgets per prompt kind; callers request only what the prompt needs
+MAX_TOKENS_BY_KIND = {
+    "greeting": 60,
+    "question": 80,
+    "analysis": 400,
+    "report": 600,
+}
+
+# Stop sequences so the server ends generation once the output is done.
+# JSON has no "```" stop: models often open with a ```json fence.
+QUESTION_STOP = ("Candidate:", "Q:", "A:", "\n\n\n")
+JSON_STOP = ("\n\n\n",)
+
+# Wire (de)serialization: orjson when installed, stdlib json otherwise
+if ORJSON_AVAILABLE:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _loads = json.loads
+
+# Logging is configured by the application; stay silent if it isn't
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMResponse:
     """Structured response from LLM."""
     content: str
@@ -25,62 +110,568 @@ class LLMResponse:
     tokens_used: int = 0
 
 
-class GeminiClient:
+class LLMResponseCache:
     """
-    Client for OpenRouter API.
-    Provides access to many models with a unified interface.
+    In-process LRU cache of LLM responses with a time-to-live.
+    Only near-deterministic (low temperature) generations are cached.
+    
+    With disk_dir set (and diskcache installed) responses are also kept on
+    disk, so repeats survive restarts and hot reloads; memory is checked
+    first and disk hits are promoted back into it.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        # Use provided key, or env var, or hardcoded fallback
-        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY") or "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"
+    # Above this temperature responses are meant to vary, so they aren't cached
+    MAX_TEMPERATURE = 0.3
+    
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl_seconds: float = 3600,
+        disk_dir: Optional[str] = None,
+        disk_ttl_seconds: float = 7 * 86400
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, LLMResponse]]" = OrderedDict()
+        # generate_analysis_batch calls in from worker threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
         
-        # OpenRouter API settings
-        self.base_url = "https://openrouter.ai/api/v1"
-        self.model = "google/gemini-2.0-flash-001"  # Good balance of speed and quality
+        # diskcache is thread- and process-safe, so it needs no extra locking
+        self.disk_ttl_seconds = disk_ttl_seconds
+        self._disk = diskcache.Cache(disk_dir) if disk_dir and DISKCACHE_AVAILABLE else None
+        if disk_dir and not DISKCACHE_AVAILABLE:
+            logger.warning("LLM_CACHE_DIR is set but diskcache is not installed; caching in memory only")
+    
+    @staticmethod
+    def cache_key(
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Digest of everything the completion depends on."""
+        return hashlib.sha256(json.dumps({
+            "model": model,
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stop": list(stop) if stop else None,
+            "json_schema": json_schema["name"] if json_schema else None,
+        }, sort_keys=True).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return a fresh cached response, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        
+        if self._disk is not None:
+            fields = self._disk.get(key)
+            if fields is not None:
+                response = LLMResponse(*fields)
+                self._remember(key, response)
+                with self._lock:
+                    self.hits += 1
+                return response
         
-        logger.info(f"OpenRouter Client initialized with model: {self.model}")
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, key: str, response: LLMResponse):
+        """Store a response in memory and, if enabled, on disk."""
+        self._remember(key, response)
+        if self._disk is not None:
+            # Plain field tuple, so entries don't depend on the class layout
+            fields = (response.content, response.is_valid, response.raw_response, response.tokens_used)
+            self._disk.set(key, fields, expire=self.disk_ttl_seconds)
+    
+    def _remember(self, key: str, response: LLMResponse):
+        """Store a response in memory, evicting the least recently used beyond maxsize."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class _CircuitBreaker:
+    """
+    Fail fast while the LLM backend is down.
+    
+    CLOSED lets every request through. FAILURE_THRESHOLD failures within
+    FAILURE_WINDOW seconds trip it OPEN, and requests are refused for
+    about OPEN_SECONDS so callers use their fallbacks immediately instead
+    of paying the retry budget. After that one trial request goes through
+    (HALF_OPEN): success closes the breaker, failure reopens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    FAILURE_THRESHOLD = 5
+    FAILURE_WINDOW = 30.0
+    OPEN_SECONDS = 15.0
     
-    def _make_request(self, prompt: str, max_tokens: int = 200, temperature: float = 0.7) -> Dict[str, Any]:
-        """Make request to OpenRouter API."""
-        import requests
+    def __init__(self):
+        self.state = self.CLOSED
+        self._failures: deque = deque()
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """Whether a request may go out now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if now < self._retry_at:
+                return False
+            # Let one trial through; if it never reports back, another follows after OPEN_SECONDS
+            self.state = self.HALF_OPEN
+            self._retry_at = now + self.OPEN_SECONDS
+            return True
+    
+    def record(self, success: bool):
+        """Report the outcome of a request that allow_request() let through."""
+        with self._lock:
+            if success:
+                self.state = self.CLOSED
+                self._failures.clear()
+                return
+            
+            now = time.monotonic()
+            self._failures.append(now)
+            while self._failures[0] < now - self.FAILURE_WINDOW:
+                self._failures.popleft()
+            
+            if self.state == self.HALF_OPEN or len(self._failures) >= self.FAILURE_THRESHOLD:
+                if self.state != self.OPEN:
+                    logger.warning("LLM circuit open for ~%.0fs after repeated failures", self.OPEN_SECONDS)
+                self.state = self.OPEN
+                # Jitter so many workers don't probe the backend in lockstep
+                self._retry_at = now + self.OPEN_SECONDS * random.uniform(0.8, 1.2)
+
+
+class BaseLLMClient(abc.ABC):
+    """
+    Shared LLM client logic: pooled HTTP sessions, response caching and
+    question/JSON/analysis helpers. Backends supply the wire format.
+    """
+    
+    name = "LLM"
+    model = ""
+    timeout: float = 30
+    
+    # Retry backoff: full-jitter exponential, in seconds
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 8.0
+    
+    def __init__(self, http2: bool = False):
+        # Keep-alive session so each call skips TCP + TLS setup
+        self._http2 = http2 and HTTP2_AVAILABLE
+        if self._http2:
+            # One multiplexed connection serves concurrent requests
+            self.session = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            )
+        else:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
         
-        url = f"{self.base_url}/chat/completions"
+        # Request bodies are pre-serialized bytes; httpx and requests name the argument differently
+        self._body_arg = "content" if self._http2 else "data"
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8000",  # Required by OpenRouter
-            "X-Title": "AI Interviewer"  # Optional - shows in OpenRouter dashboard
-        }
+        # Async clients for callers on the event loop; created on first use.
+        # aiohttp stays flat under many concurrent requests where httpx's
+        # AsyncClient degrades; httpx is kept for HTTP/2 and streaming.
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aiohttp = None
+        self._use_aiohttp = AIOHTTP_AVAILABLE and not self._http2
+        self._async_sem: Optional[asyncio.Semaphore] = None
         
-        payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-        }
+        self.cache = LLMResponseCache(disk_dir=config.llm.cache_dir or None)
+        self.breaker = _CircuitBreaker()
+        self.max_retries = config.llm.max_retries
+    
+    def _warmup_url(self) -> Optional[str]:
+        """Cheap endpoint on the LLM host used to pre-open a connection."""
+        return None
+    
+    def warmup(self):
+        """
+        Open a pooled connection in a background thread.
         
-        try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"OpenRouter API error: {e}")
-            return {"error": str(e)}
+        DNS, TCP and TLS setup then overlap app startup instead of landing
+        on the first interview turn. Any response (even an error status)
+        leaves the connection in the pool.
+        """
+        url = self._warmup_url()
+        if not url:
+            return
+        
+        def _open():
+            try:
+                self.session.get(url, timeout=5)
+            except Exception as e:
+                logger.debug("%s warmup failed: %s", self.name, e)
+        
+        threading.Thread(target=_open, name=f"{self.name}-warmup", daemon=True).start()
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Delay before the next retry.
+        
+        Jitter keeps concurrent callers from retrying in lockstep; a
+        server-provided Retry-After takes precedence, up to the cap.
+        """
+        if retry_after:
+            try:
+                return min(self.RETRY_MAX_DELAY, float(retry_after))
+            except ValueError:
+                pass
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.5)
+    
+    @abc.abstractmethod
+    def _request_parts(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system_prompt: Optional[str],
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """
+        Build the URL, headers and payload for one completion.
+        
+        json_schema is {"name": ..., "schema": ...}; when given, the backend
+        constrains decoding so the output matches the schema.
+        """
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def _extract_content(self, response: Dict[str, Any]) -> Tuple[str, int]:
+        """Pull (content, tokens_used) out of a raw response; KeyError/IndexError if malformed."""
+        raise NotImplementedError
+    
+    @abc.abstractmethod
+    def _extract_delta(self, chunk: Dict[str, Any]) -> Tuple[str, bool]:
+        """Pull (text, finished) out of one streamed chunk."""
+        raise NotImplementedError
+    
+    def _feed_stream_line(self, line: str, text: str) -> Tuple[str, bool]:
+        """
+        Add one SSE line to the streamed text.
+        
+        Returns:
+            (text so far, finished) where finished means the server is done
+        """
+        if not line.startswith("data:"):
+            return text, False
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return text, True
+        
+        piece, finished = self._extract_delta(_loads(data))
+        return text + piece, finished
+    
+    @staticmethod
+    def _split_question(text: str, finished: bool) -> Tuple[str, bool]:
+        """
+        Find how much of the streamed text belongs to the question.
+        
+        The question ends at its first "?". A paragraph break after some
+        content ends it only if no "?" follows before the stream finishes,
+        so a greeting like "Hi, I'm Alex.\n\nCould you...?" is kept whole;
+        text after a pending break is held back until that is known.
+        
+        Returns:
+            (question text that may be emitted, whether it is complete)
+        """
+        mark_re = QUESTION_MARK_FINAL_RE if finished else QUESTION_MARK_RE
+        match = mark_re.search(text)
+        if match:
+            return text[:match.end()], True
+        
+        for brk in PARAGRAPH_BREAK_RE.finditer(text):
+            if text[:brk.start()].strip():
+                return text[:brk.start()], finished
+        return text, finished
+    
+    def _stream_lines(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Iterator[str]:
+        """Yield SSE lines; leaving the generator early closes the response."""
+        if isinstance(self.session, httpx.Client):
+            with self.session.stream("POST", url, content=_dumps(payload), headers=headers, timeout=self.timeout) as response:
+                response.raise_for_status()
+                yield from response.iter_lines()
+        else:
+            with self.session.post(url, data=_dumps(payload), headers=headers, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                yield from response.iter_lines(decode_unicode=True)
+    
+    def _stream_question(self, prompt: str, max_tokens: int, system_prompt: Optional[str]) -> LLMResponse:
+        """
+        Stream a question and stop reading once it is complete.
+        
+        Closing the response early aborts server-side generation, so the
+        unused tail of max_tokens is never decoded.
+        """
+        url, headers, payload = self._request_parts(prompt, max_tokens, 0.7, system_prompt, QUESTION_STOP)
+        text = ""
+        for line in self._stream_lines(url, headers, {**payload, "stream": True}):
+            text, finished = self._feed_stream_line(line, text)
+            if self._split_question(text, finished)[1]:
+                break
+        text = self._split_question(text, True)[0].strip()
+        return LLMResponse(content=text, is_valid=bool(text), raw_response={"streamed": True})
+    
+    def _get_aclient(self) -> httpx.AsyncClient:
+        """The shared httpx async client, created on first use."""
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=self._http2,
+                limits=httpx.Limits(max_connections=ASYNC_CONCURRENCY, max_keepalive_connections=16),
+                timeout=self.timeout
+            )
+        return self._aclient
+    
+    def _get_async_sem(self) -> asyncio.Semaphore:
+        """Semaphore bounding this client's in-flight async requests."""
+        if self._async_sem is None:
+            self._async_sem = asyncio.Semaphore(ASYNC_CONCURRENCY)
+        return self._async_sem
+    
+    async def _apost(self, url: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Optional[str], bytes]:
+        """
+        POST a serialized body.
+        
+        Returns:
+            (status code, Retry-After header, response body)
+        """
+        if self._use_aiohttp:
+            if self._aiohttp is None:
+                self._aiohttp = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=100, limit_per_host=32, keepalive_timeout=60),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                )
+            async with self._aiohttp.post(url, data=body, headers=headers) as response:
+                return response.status, response.headers.get("Retry-After"), await response.read()
+        
+        response = await self._get_aclient().post(url, content=body, headers=headers)
+        return response.status_code, response.headers.get("Retry-After"), response.content
+    
+    async def _astream_pieces(self, prompt: str, max_tokens: int, system_prompt: Optional[str]) -> AsyncIterator[str]:
+        """Yield a question's text as it streams in, stopping once it is complete."""
+        url, headers, payload = self._request_parts(prompt, max_tokens, 0.7, system_prompt, QUESTION_STOP)
+        
+        text = ""
+        sent = 0
+        body = _dumps({**payload, "stream": True})
+        async with self._get_async_sem():
+            async with self._get_aclient().stream("POST", url, content=body, headers=headers) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    text, finished = self._feed_stream_line(line, text)
+                    question, done = self._split_question(text, finished)
+                    if len(question) > sent:
+                        yield question[sent:]
+                        sent = len(question)
+                    if done:
+                        return
+        
+        # The connection closed without a finish marker; flush what was held back
+        question = self._split_question(text, True)[0]
+        if len(question) > sent:
+            yield question[sent:]
+    
+    async def _astream_question(self, prompt: str, max_tokens: int, system_prompt: Optional[str]) -> LLMResponse:
+        """Async counterpart of _stream_question()."""
+        text = "".join([piece async for piece in self._astream_pieces(prompt, max_tokens, system_prompt)])
+        text = text.strip()
+        return LLMResponse(content=text, is_valid=bool(text), raw_response={"streamed": True})
+    
+    def _make_request(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Make request to the LLM API."""
+        url, headers, payload = self._request_parts(
+            prompt, max_tokens, temperature, system_prompt, stop, json_schema
+        )
+        body = {self._body_arg: _dumps(payload)}
+        
+        for attempt in range(self.max_retries + 1):
+            retries_left = attempt < self.max_retries
+            try:
+                response = self.session.post(url, headers=headers, timeout=self.timeout, **body)
+                if response.status_code in RETRY_STATUSES and retries_left:
+                    time.sleep(self._retry_delay(attempt, response.headers.get("Retry-After")))
+                    continue
+                response.raise_for_status()
+                return _loads(response.content)
+            except TRANSIENT_ERRORS as e:
+                if retries_left:
+                    logger.warning("%s request failed (%s), retrying", self.name, e)
+                    time.sleep(self._retry_delay(attempt))
+                    continue
+                logger.error("%s API error: %s", self.name, e)
+                return {"error": str(e)}
+            except Exception as e:
+                logger.error("%s API error: %s", self.name, e)
+                return {"error": str(e)}
+    
+    async def _amake_request(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Make request to the LLM API without blocking the event loop."""
+        url, headers, payload = self._request_parts(
+            prompt, max_tokens, temperature, system_prompt, stop, json_schema
+        )
+        body = _dumps(payload)
+        
+        for attempt in range(self.max_retries + 1):
+            retries_left = attempt < self.max_retries
+            try:
+                # Hold a slot only for the request itself, not the backoff sleep
+                async with self._get_async_sem():
+                    status, retry_after, content = await self._apost(url, headers, body)
+                if status in RETRY_STATUSES and retries_left:
+                    await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                    continue
+                if status >= 400:
+                    logger.error("%s API error: HTTP %s", self.name, status)
+                    return {"error": f"HTTP {status}"}
+                return _loads(content)
+            except TRANSIENT_ERRORS as e:
+                if retries_left:
+                    logger.warning("%s request failed (%s), retrying", self.name, e)
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                logger.error("%s API error: %s", self.name, e)
+                return {"error": str(e)}
+            except Exception as e:
+                logger.error("%s API error: %s", self.name, e)
+                return {"error": str(e)}
+    
+    async def aclose(self):
+        """Close the async clients' pooled connections."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+        if self._aiohttp is not None:
+            await self._aiohttp.close()
+            self._aiohttp = None
     
     def generate(
         self,
         prompt: str,
         max_tokens: int = 200,
         temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
         **kwargs  # Accept but ignore extra params for compatibility
     ) -> LLMResponse:
-        """Generate completion from OpenRouter."""
-        response = self._make_request(prompt, max_tokens, temperature)
+        """Generate a completion."""
+        key = self._cache_key(prompt, max_tokens, temperature, system_prompt, stop, json_schema)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if not self.breaker.allow_request():
+            return self._circuit_open_response()
         
+        raw = self._make_request(prompt, max_tokens, temperature, system_prompt, stop, json_schema)
+        self.breaker.record("error" not in raw)
+        response = self._to_response(raw)
+        if key is not None and response.is_valid:
+            self.cache.put(key, response)
+        return response
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Async counterpart of generate()."""
+        key = self._cache_key(prompt, max_tokens, temperature, system_prompt, stop, json_schema)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if not self.breaker.allow_request():
+            return self._circuit_open_response()
+        
+        raw = await self._amake_request(prompt, max_tokens, temperature, system_prompt, stop, json_schema)
+        self.breaker.record("error" not in raw)
+        response = self._to_response(raw)
+        if key is not None and response.is_valid:
+            self.cache.put(key, response)
+        return response
+    
+    @staticmethod
+    def _circuit_open_response() -> LLMResponse:
+        """Invalid response returned without a request while the breaker is open."""
+        return LLMResponse(
+            content="",
+            is_valid=False,
+            raw_response={"error": "circuit open"},
+            tokens_used=0
+        )
+    
+    def _cache_key(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system_prompt: Optional[str],
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Cache key for a generation, or None if it shouldn't be cached."""
+        if temperature > LLMResponseCache.MAX_TEMPERATURE:
+            return None
+        return LLMResponseCache.cache_key(
+            self.model, prompt, temperature, max_tokens, system_prompt, stop, json_schema
+        )
+    
+    def _to_response(self, response: Dict[str, Any]) -> LLMResponse:
+        """Wrap a raw API response dict in an LLMResponse."""
         if "error" in response:
             return LLMResponse(
                 content="",
@@ -90,8 +681,7 @@ class GeminiClient:
             )
         
         try:
-            content = response["choices"][0]["message"]["content"]
-            tokens = response.get("usage", {}).get("total_tokens", 0)
+            content, tokens = self._extract_content(response)
             
             return LLMResponse(
                 content=content.strip(),
@@ -100,7 +690,7 @@ class GeminiClient:
                 tokens_used=tokens
             )
         except (KeyError, IndexError) as e:
-            logger.error(f"Failed to parse OpenRouter response: {e}")
+            logger.error("Failed to parse %s response: %s", self.name, e)
             return LLMResponse(
                 content="",
                 is_valid=False,
@@ -111,21 +701,97 @@ class GeminiClient:
     def generate_question(
         self,
         prompt: str,
-        max_tokens: int = 150,
+        max_tokens: int = MAX_TOKENS_BY_KIND["question"],
+        system_prompt: Optional[str] = None,
     ) -> Tuple[str, bool]:
         """
         Generate an interview question.
+        
+        Args:
+            prompt: Turn-specific part of the prompt
+            max_tokens: Token limit for the question
+            system_prompt: Static instructions shared across calls, sent first
         """
-        logger.info("Generating question via OpenRouter...")
+        logger.info("Generating question via %s...", self.name)
+        if not self.breaker.allow_request():
+            return self._to_question(self._circuit_open_response())
         
-        response = self.generate(
-            prompt=prompt,
-            max_tokens=max_tokens,
-            temperature=0.7,
-        )
+        try:
+            response = self._stream_question(prompt, max_tokens, system_prompt)
+            self.breaker.record(True)
+        except Exception as e:
+            # Streaming failed; the regular path retries transient errors
+            self.breaker.record(False)
+            logger.warning("%s streaming failed (%s), retrying without streaming", self.name, e)
+            response = self.generate(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                system_prompt=system_prompt,
+                stop=QUESTION_STOP,
+            )
+        return self._to_question(response)
+    
+    async def agenerate_question(
+        self,
+        prompt: str,
+        max_tokens: int = MAX_TOKENS_BY_KIND["question"],
+        system_prompt: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """Async counterpart of generate_question()."""
+        logger.info("Generating question via %s...", self.name)
+        if not self.breaker.allow_request():
+            return self._to_question(self._circuit_open_response())
         
+        try:
+            response = await self._astream_question(prompt, max_tokens, system_prompt)
+            self.breaker.record(True)
+        except Exception as e:
+            self.breaker.record(False)
+            logger.warning("%s streaming failed (%s), retrying without streaming", self.name, e)
+            response = await self.agenerate(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                system_prompt=system_prompt,
+                stop=QUESTION_STOP,
+            )
+        return self._to_question(response)
+    
+    async def astream_question(
+        self,
+        prompt: str,
+        max_tokens: int = MAX_TOKENS_BY_KIND["question"],
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield an interview question piece by piece as the server decodes it.
+        
+        Yields nothing if the breaker is open or the request fails before
+        any text arrives; the caller then supplies a fallback. A failure
+        after some text has been yielded is re-raised, since the caller
+        would otherwise take the truncated text for the whole question.
+        """
+        if not self.breaker.allow_request():
+            return
+        
+        yielded = False
+        try:
+            async for piece in self._astream_pieces(prompt, max_tokens, system_prompt):
+                yielded = True
+                yield piece
+            self.breaker.record(True)
+        except Exception as e:
+            self.breaker.record(False)
+            logger.warning("%s streaming failed (%s)", self.name, e)
+            if yielded:
+                raise
+    
+    @staticmethod
+    def _to_question(response: LLMResponse) -> Tuple[str, bool]:
+        """Clean a question response into (question, is_valid)."""
         if not response.is_valid:
-            logger.warning(f"OpenRouter response invalid: {response.raw_response}")
+            logger.warning("LLM response invalid: %s", response.raw_response)
             return "", False
         
         # Clean the response
@@ -135,7 +801,7 @@ class GeminiClient:
         if cleaned.startswith('"') and cleaned.endswith('"'):
             cleaned = cleaned[1:-1]
         
-        logger.info(f"OpenRouter response: {cleaned[:100]}...")
+        logger.info("LLM response: %.100s...", cleaned)
         
         return cleaned, bool(cleaned)
     
@@ -144,40 +810,155 @@ class GeminiClient:
         prompt: str,
         max_tokens: int = 400,
         temperature: float = 0.3,
+        json_schema: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Optional[Dict], bool]:
-        """Generate JSON response."""
+        """
+        Generate JSON response.
+        
+        Args:
+            prompt: Prompt describing the expected JSON
+            max_tokens: Token limit for the response
+            temperature: Sampling temperature
+            json_schema: Optional {"name", "schema"} to constrain decoding;
+                without it the JSON is found in free-form output
+        """
         response = self.generate(
             prompt=prompt,
             max_tokens=max_tokens,
             temperature=temperature,
+            stop=JSON_STOP,
+            json_schema=json_schema,
         )
-        
+        return self._to_json(response)
+    
+    async def agenerate_json(
+        self,
+        prompt: str,
+        max_tokens: int = 400,
+        temperature: float = 0.3,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Optional[Dict], bool]:
+        """Async counterpart of generate_json()."""
+        response = await self.agenerate(
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=JSON_STOP,
+            json_schema=json_schema,
+        )
+        return self._to_json(response)
+    
+    @staticmethod
+    def _to_json(response: LLMResponse) -> Tuple[Optional[Dict], bool]:
+        """Parse the JSON object out of a response."""
         if not response.is_valid:
             return None, False
         
-        content = response.content
-        
-        # Try to find JSON in the response
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', content, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group()), True
-            except json.JSONDecodeError:
-                pass
-        
-        # Try parsing the whole content
-        try:
-            return json.loads(content), True
-        except json.JSONDecodeError:
+        # Bare JSON fast path, else the first embedded object; callers index
+        # the result by key, so a leading array like "[7]" must not win
+        result = ResponseCleaner.decode_json(response.content, openers="{")
+        if not isinstance(result, dict):
+            logger.warning("No JSON object found in LLM response: %.200s", response.content)
             return None, False
+        return result, True
     
     def generate_analysis(
         self,
         prompt: str,
-        max_tokens: int = 500,
+        max_tokens: int = MAX_TOKENS_BY_KIND["analysis"],
     ) -> Tuple[Optional[Dict], bool]:
-        """Generate analysis response (JSON expected)."""
-        return self.generate_json(prompt, max_tokens, temperature=0.3)
+        """Generate analysis response, constrained to the analysis schema."""
+        return self.generate_json(prompt, max_tokens, temperature=0.3, json_schema=ANALYSIS_JSON_SCHEMA)
+    
+    async def agenerate_analysis(
+        self,
+        prompt: str,
+        max_tokens: int = MAX_TOKENS_BY_KIND["analysis"],
+    ) -> Tuple[Optional[Dict], bool]:
+        """Async counterpart of generate_analysis()."""
+        return await self.agenerate_json(prompt, max_tokens, temperature=0.3, json_schema=ANALYSIS_JSON_SCHEMA)
+    
+    def generate_analysis_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = MAX_TOKENS_BY_KIND["analysis"],
+        max_workers: int = 8,
+    ) -> List[Tuple[Optional[Dict], bool]]:
+        """
+        Generate analyses for many prompts at once.
+        
+        Each request carries a single prompt, so the prompts are submitted
+        concurrently rather than as one payload; total latency is roughly
+        that of the slowest request.
+        
+        Args:
+            prompts: Analysis prompts
+            max_tokens: Token limit per analysis
+            max_workers: Maximum requests in flight
+            
+        Returns:
+            One (result, is_valid) tuple per prompt, in input order
+        """
+        if not prompts:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+            return list(pool.map(lambda p: self.generate_analysis(p, max_tokens), prompts))
+    
+    async def batch_generate(
+        self,
+        prompts: List[str],
+        concurrency: int = 16,
+        **kwargs
+    ) -> List[LLMResponse]:
+        """
+        Run many independent generations with a steady window of requests in flight.
+        
+        A fixed set of workers pulls prompts off a queue, so a new request
+        starts as soon as one finishes, and at most `concurrency` are ever
+        outstanding; unlike gathering every prompt at once, a large batch
+        doesn't flood the server.
+        
+        Args:
+            prompts: Prompts to complete
+            concurrency: Maximum requests in flight
+            **kwargs: Passed through to agenerate()
+            
+        Returns:
+            One LLMResponse per prompt, in input order
+        """
+        results: List[Optional[LLMResponse]] = [None] * len(prompts)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(prompts):
+            queue.put_nowait(item)
+        
+        async def worker():
+            while True:
+                try:
+                    i, prompt = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[i] = await self.agenerate(prompt, **kwargs)
+        
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(prompts)))))
+        return results
+    
+    async def agenerate_analysis_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = MAX_TOKENS_BY_KIND["analysis"],
+        concurrency: int = 16,
+    ) -> List[Tuple[Optional[Dict], bool]]:
+        """Async counterpart of generate_analysis_batch(), bounded by batch_generate()."""
+        responses = await self.batch_generate(
+            prompts,
+            concurrency=concurrency,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            stop=JSON_STOP,
+            json_schema=ANALYSIS_JSON_SCHEMA,
+        )
+        return [self._to_json(response) for response in responses]
     
     def health_check(self) -> bool:
         """Check if API is responding."""
@@ -188,8 +969,170 @@ class GeminiClient:
             return False
 
 
-# Global client instance
-llm_client = GeminiClient()
+class OpenRouterClient(BaseLLMClient):
+    """
+    Client for OpenRouter API.
+    Provides access to many models with a unified interface.
+    """
+    
+    name = "OpenRouter"
+    
+    # Providers that only reuse a prefix when it carries an explicit cache_control breakpoint
+    EXPLICIT_CACHE_PREFIXES = ("anthropic/",)
+    
+    def __init__(self, api_key: Optional[str] = None):
+        # Use provided key or env var; never ship a key in source
+        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY", "")
+        if not self.api_key:
+            logger.warning("OPENROUTER_API_KEY is not set; OpenRouter requests will be rejected")
+        
+        # OpenRouter API settings
+        self.base_url = "https://openrouter.ai/api/v1"
+        self.model = "google/gemini-2.0-flash-001"  # Good balance of speed and quality
+        self._url = f"{self.base_url}/chat/completions"
+        
+        # Identical for every request, so build once
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:8000",  # Required by OpenRouter
+            "X-Title": "AI Interviewer"  # Optional - shows in OpenRouter dashboard
+        }
+        
+        super().__init__(http2=config.llm.http2)
+        
+        logger.info("OpenRouter Client initialized with model: %s", self.model)
+    
+    def _warmup_url(self) -> Optional[str]:
+        return f"{self.base_url}/models"
+    
+    def _request_parts(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system_prompt: Optional[str],
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the URL, headers and payload for a chat completion."""
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            # Static system message first keeps a byte-identical, cacheable prefix
+            if self.model.startswith(self.EXPLICIT_CACHE_PREFIXES):
+                system_content = [{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]
+            else:
+                system_content = system_prompt
+            messages.insert(0, {"role": "system", "content": system_content})
+        
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            # Only route to providers honouring every parameter (stop, max_tokens)
+            "provider": {"require_parameters": True},
+        }
+        if stop:
+            payload["stop"] = list(stop)
+        if json_schema:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {**json_schema, "strict": True},
+            }
+        
+        return self._url, self._headers, payload
+    
+    def _extract_content(self, response: Dict[str, Any]) -> Tuple[str, int]:
+        """Read the first choice and token usage from a chat completion."""
+        content = response["choices"][0]["message"]["content"]
+        return content, response.get("usage", {}).get("total_tokens", 0)
+    
+    def _extract_delta(self, chunk: Dict[str, Any]) -> Tuple[str, bool]:
+        """Read the text delta and finish flag from a streamed chat chunk."""
+        choices = chunk.get("choices") or [{}]
+        delta = choices[0].get("delta", {}).get("content") or ""
+        return delta, choices[0].get("finish_reason") is not None
+
+
+class LlamaCppClient(BaseLLMClient):
+    """
+    Client for a local llama.cpp server's /completion endpoint.
+    """
+    
+    name = "llama.cpp"
+    model = "llama.cpp"
+    
+    def __init__(self):
+        self.url = config.llm.completion_url
+        self.timeout = config.llm.timeout
+        self._headers = {"Content-Type": "application/json"}
+        
+        # llama-server speaks HTTP/1.1 only
+        super().__init__(http2=False)
+        
+        logger.info("llama.cpp Client initialized at: %s", self.url)
+    
+    def _warmup_url(self) -> Optional[str]:
+        return f"{config.llm.base_url}/health"
+    
+    def _request_parts(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system_prompt: Optional[str],
+        stop: Optional[Sequence[str]] = None,
+        json_schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the URL, headers and payload for a raw completion."""
+        if system_prompt:
+            # Static instructions first so the server's prompt cache reuses them
+            prompt = f"{system_prompt}\n\n{prompt}"
+        
+        payload = {
+            "prompt": prompt,
+            "n_predict": max_tokens,
+            "temperature": temperature,
+            "top_p": config.llm.default_top_p,
+            "repeat_penalty": config.llm.default_repeat_penalty,
+            "cache_prompt": True,
+        }
+        if stop:
+            payload["stop"] = list(stop)
+        if json_schema:
+            # llama-server compiles the schema into a sampling grammar
+            payload["json_schema"] = json_schema["schema"]
+        
+        return self.url, self._headers, payload
+    
+    def _extract_content(self, response: Dict[str, Any]) -> Tuple[str, int]:
+        """Read the generated text and token counts from a completion."""
+        content = response["content"]
+        tokens = response.get("tokens_evaluated", 0) + response.get("tokens_predicted", 0)
+        return content, tokens
+    
+    def _extract_delta(self, chunk: Dict[str, Any]) -> Tuple[str, bool]:
+        """Read the text piece and stop flag from a streamed completion chunk."""
+        return chunk.get("content", ""), bool(chunk.get("stop"))
+
+
+def make_client() -> BaseLLMClient:
+    """Create the client for the configured backend."""
+    if config.llm.backend == "llamacpp":
+        return LlamaCppClient()
+    return OpenRouterClient()
+
+
+# Global client instance; only the selected backend opens a session
+llm_client = make_client()
+if config.llm.warmup:
+    llm_client.warmup()
 
-# Alias for backward compatibility
-LLMClient = GeminiClient
+# Aliases for backward compatibility
+GeminiClient = OpenRouterClient
+LLMClient = OpenRouterClient
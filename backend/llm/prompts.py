@@ -6,87 +6,254 @@ Clean, simple prompts that produce professional interviewer responses.
 """
 
 
-class Prompts:
-    """Collection of agent prompts optimized for Gemini."""
-    
-    # ============================================================
-    # INTERVIEWER AGENT PROMPTS
-    # ============================================================
-    
-    @staticmethod
-    def interviewer_greeting(job_role: str) -> str:
-        """Prompt for initial greeting."""
-        return f"""You are Alex, a professional and friendly job interviewer conducting an interview for a {job_role} position.
+import itertools
+import sys
+from string import Template
+from types import MappingProxyType
+from typing import Optional, Tuple
+
+
+# Shared by every interviewer call and never interpolated, so the provider can
+# reuse the cached prefix; everything candidate-specific goes in the suffix
+INTERVIEWER_SYSTEM_PROMPT = sys.intern("""You are Alex, a professional and friendly job interviewer.
+
+You only ever speak as the interviewer: you ask questions, you never answer them.
+Respond with ONLY your spoken words - no labels, quotes, or explanations. Be conversational and professional.""")
+
+DIFFICULTY_DESCRIPTIONS = {
+    1: "basic/entry-level",
+    2: "intermediate",
+    3: "mid-level",
+    4: "advanced",
+    5: "senior/expert-level"
+}
 
-Your task: Greet the candidate warmly, introduce yourself as Alex the interviewer, and ask them to introduce themselves.
 
-Respond with ONLY your spoken words (1-2 sentences). Be warm and professional."""
+# Interviewer task text, fixed per phase. Each prompt is this text followed by
+# the per-turn fields, so only the short tail after it differs between calls.
+# Interned so every session shares one copy; static prompts return them as-is.
+_GREETING_TASK = sys.intern("""Your task: Greet the candidate warmly, introduce yourself as Alex the interviewer, and ask them to introduce themselves.
 
-    @staticmethod
-    def interviewer_introduction(job_role: str, candidate_info: str) -> str:
-        """Prompt for introduction phase questions."""
-        return f"""You are Alex, interviewing a candidate for a {job_role} position.
+Respond in 1-2 sentences.
 
-What you know about the candidate so far: {candidate_info}
+""")
 
-Your task: Ask ONE follow-up question about their background, experience, or motivation for applying.
+_INTRODUCTION_TASK = sys.intern("""Your task: Ask ONE follow-up question about the candidate's background, experience, or motivation for applying.
 
-Respond with ONLY your spoken question (1 sentence). Be conversational and professional."""
+Respond with a single question (1 sentence).
 
-    @staticmethod
-    def interviewer_technical(job_role: str, technologies: str, difficulty: int, covered_topics: str) -> str:
-        """Prompt for technical phase questions."""
-        difficulty_desc = {
-            1: "basic/entry-level",
-            2: "intermediate", 
-            3: "mid-level",
-            4: "advanced",
-            5: "senior/expert-level"
-        }
-        level = difficulty_desc.get(difficulty, "mid-level")
-        
-        return f"""You are Alex, a technical interviewer for a {job_role} position.
+""")
+
+# One fully rendered task per difficulty, so the level is part of the fixed text
+_TECHNICAL_TASKS = MappingProxyType({
+    difficulty: sys.intern(f"""You are the technical interviewer.
 
-Candidate's technologies: {technologies or 'not yet discussed'}
 Difficulty level: {level}
-Topics already covered: {covered_topics or 'none yet'}
 
-Your task: Ask ONE {level} technical question relevant to {job_role}. Focus on practical knowledge and problem-solving.
+Your task: Ask ONE {level} technical question relevant to the position below. Focus on practical knowledge and problem-solving.
 
-Respond with ONLY your spoken question. Be specific and clear."""
+Be specific and clear.
 
-    @staticmethod
-    def interviewer_behavioral(recent_context: str) -> str:
-        """Prompt for behavioral phase questions."""
-        return f"""You are Alex, a professional interviewer conducting a behavioral interview.
+""")
+    for difficulty, level in DIFFICULTY_DESCRIPTIONS.items()
+})
+
+_BEHAVIORAL_TASK = sys.intern("""You are conducting a behavioral interview.
 
 Your task: Ask ONE behavioral interview question using the "Tell me about a time when..." format.
 
-Focus on topics like: teamwork, challenges, leadership, conflict resolution, or learning from mistakes.
+Focus on topics like: teamwork, challenges, leadership, conflict resolution, or learning from mistakes.""")
 
-Respond with ONLY your spoken question. Be conversational."""
+_SITUATIONAL_TASK = sys.intern("""Your task: Ask ONE hypothetical scenario question using "What would you do if..." or "How would you handle..." format.
 
-    @staticmethod
-    def interviewer_situational(job_role: str, candidate_skills: str) -> str:
-        """Prompt for situational phase questions."""
-        return f"""You are Alex, interviewing for a {job_role} position.
+The scenario should test judgment, problem-solving, or decision-making relevant to the position below.
+
+""")
+
+_CLOSING_TASK = sys.intern("""You are concluding a job interview.
+
+Your task: Thank the candidate for their time and ask if they have any questions about the role or the team.
+
+Respond in 1-2 sentences.""")
+
+# Per-turn templates, compiled once. Fixed instructions come first and the
+# per-call values last, so the server's prefix cache covers the shared part
+# of every call. The analysis and report JSON structure is enforced at decode
+# time by ANALYSIS_JSON_SCHEMA / REPORT_JSON_SCHEMA, so those prompts only say
+# what the fields mean.
+_ANALYZE_ANSWER_TEMPLATE = Template("""Analyze this interview answer. Return JSON.
+Scores 1-10: quality_score (structure, articulation), relevance_score (to the question), completeness_score, technical_depth (if applicable), communication_quality (clarity, professionalism).
+extracted_info: what the answer reveals about the candidate. red_flags / positive_signs: concerns and strengths shown (may be empty).
+
+Position: $job_role
+Interview Phase: $phase
+Question Asked: "$question"
+Candidate's Answer: "$answer\"""")
 
-Candidate's skills: {candidate_skills or 'various technical skills'}
+_REPORT_TEMPLATE = Template("""Write a professional interview assessment. Return JSON.
+fit_score: overall fit 1-10. summary: 2-3 sentences. weaknesses: areas for improvement. next_steps: recommended next steps in the hiring process.
+
+Position: $job_role
+
+Candidate Profile:
+$candidate_profile
+
+Average Scores: $avg_scores
+Concerns: $red_flags
+Positives: $positive_signs""")
+
+# JSON Schemas for the templates above, in the OpenAI json_schema shape.
+# Both backends constrain decoding with them (llama.cpp compiles the schema to
+# a grammar), so the output is valid JSON of the expected shape by construction.
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+_SCORE = {"type": "integer", "minimum": 1, "maximum": 10}
+
+ANALYSIS_JSON_SCHEMA = {
+    "name": "answer_analysis",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "quality_score": _SCORE,
+            "relevance_score": _SCORE,
+            "completeness_score": _SCORE,
+            "technical_depth": _SCORE,
+            "communication_quality": _SCORE,
+            "extracted_info": {
+                "type": "object",
+                "properties": {
+                    "skills": _STRING_LIST,
+                    "technologies": _STRING_LIST,
+                    "experience_level": {"type": "string"},
+                    "communication_style": {"type": "string"},
+                    "confidence_indicator": {"type": "string"},
+                    "key_points": _STRING_LIST,
+                },
+                "required": [
+                    "skills", "technologies", "experience_level",
+                    "communication_style", "confidence_indicator", "key_points"
+                ],
+                "additionalProperties": False,
+            },
+            "suggested_follow_ups": _STRING_LIST,
+            "areas_to_probe": _STRING_LIST,
+            "red_flags": _STRING_LIST,
+            "positive_signs": _STRING_LIST,
+        },
+        "required": [
+            "quality_score", "relevance_score", "completeness_score",
+            "technical_depth", "communication_quality", "extracted_info",
+            "suggested_follow_ups", "areas_to_probe", "red_flags", "positive_signs"
+        ],
+        "additionalProperties": False,
+    },
+}
+
+REPORT_JSON_SCHEMA = {
+    "name": "interview_report",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "recommendation": {"type": "string", "enum": ["Strong Hire", "Hire", "Maybe", "No Hire"]},
+            "fit_score": _SCORE,
+            "summary": {"type": "string"},
+            "strengths": _STRING_LIST,
+            "weaknesses": _STRING_LIST,
+            "next_steps": _STRING_LIST,
+        },
+        "required": ["recommendation", "fit_score", "summary", "strengths", "weaknesses", "next_steps"],
+        "additionalProperties": False,
+    },
+}
+
+_FOLLOW_UP_TEMPLATE = Template("""You are Alex, a job interviewer.
+
+Your task: Ask ONE follow-up question to get more detail about the area to explore below.
+
+Respond with ONLY your spoken question. Be curious and professional.
+
+Position: $job_role
+Previous question: "$last_question"
+Candidate's answer: "$last_answer"
+Area to explore further: $area_to_probe""")
+
+_EXTRACT_FACTS_TEMPLATE = Template("""Extract factual information from an interview answer.
+
+Return a JSON array of facts. Each fact should have:
+- type: "skill", "technology", "experience", "project", "behavior", or "achievement"
+- content: The fact as a clear statement
+- confidence: "high", "medium", or "low"
+
+Respond with ONLY the JSON array.
+
+Phase: $phase
+Question: "$question"
+Answer: "$answer\"""")
+
+_NEXT_ACTION_TEMPLATE = Template("""Decide the next interview action.
+
+Return a JSON object with:
+- should_transition_phase: true or false
+- next_topic: topic to explore next
+- difficulty_adjustment: -1, 0, or 1
+- action: "follow_up", "new_topic", or "transition"
 
-Your task: Ask ONE hypothetical scenario question using "What would you do if..." or "How would you handle..." format.
+Respond with ONLY the JSON object.
 
-The scenario should test judgment, problem-solving, or decision-making relevant to the role.
+Current Phase: $phase
+Questions in this phase: $phase_question_count
+Topics covered: $covered_topics
+Recent scores: $recent_scores""")
 
-Respond with ONLY your spoken question."""
 
+class Prompts:
+    """Collection of agent prompts optimized for Gemini."""
+    
+    # ============================================================
+    # INTERVIEWER AGENT PROMPTS
+    # Each returns (static_prefix, dynamic_suffix)
+    # ============================================================
+    
     @staticmethod
-    def interviewer_closing() -> str:
-        """Prompt for closing phase."""
-        return """You are Alex, concluding a job interview.
+    def interviewer_greeting(job_role: str) -> Tuple[str, str]:
+        """Prompt for initial greeting."""
+        return INTERVIEWER_SYSTEM_PROMPT, f"{_GREETING_TASK}Position: {job_role}"
 
-Your task: Thank the candidate for their time and ask if they have any questions about the role or the team.
+    @staticmethod
+    def interviewer_introduction(job_role: str, candidate_info: str) -> Tuple[str, str]:
+        """Prompt for introduction phase questions."""
+        return INTERVIEWER_SYSTEM_PROMPT, (
+            f"{_INTRODUCTION_TASK}Position: {job_role}\n"
+            f"What you know about the candidate so far: {candidate_info}"
+        )
 
-Respond with ONLY your spoken words (1-2 sentences). Be warm and professional."""
+    @staticmethod
+    def interviewer_technical(job_role: str, technologies: str, difficulty: int, covered_topics: str) -> Tuple[str, str]:
+        """Prompt for technical phase questions."""
+        task = _TECHNICAL_TASKS.get(difficulty) or _TECHNICAL_TASKS[3]
+        
+        return INTERVIEWER_SYSTEM_PROMPT, (
+            f"{task}Position: {job_role}\n"
+            f"Candidate's technologies: {technologies or 'not yet discussed'}\n"
+            f"Topics already covered: {covered_topics or 'none yet'}"
+        )
+
+    @staticmethod
+    def interviewer_behavioral(recent_context: str) -> Tuple[str, str]:
+        """Prompt for behavioral phase questions."""
+        return INTERVIEWER_SYSTEM_PROMPT, _BEHAVIORAL_TASK
+
+    @staticmethod
+    def interviewer_situational(job_role: str, candidate_skills: str) -> Tuple[str, str]:
+        """Prompt for situational phase questions."""
+        return INTERVIEWER_SYSTEM_PROMPT, (
+            f"{_SITUATIONAL_TASK}Position: {job_role}\n"
+            f"Candidate's skills: {candidate_skills or 'various technical skills'}"
+        )
+
+    @staticmethod
+    def interviewer_closing() -> Tuple[str, str]:
+        """Prompt for closing phase."""
+        return INTERVIEWER_SYSTEM_PROMPT, _CLOSING_TASK
 
     # ============================================================
     # ANALYSIS AGENT PROMPT
@@ -94,26 +261,17 @@ Respond with ONLY your spoken words (1-2 sentences). Be warm and professional.""
     
     @staticmethod
     def analyze_answer(job_role: str, phase: str, question: str, answer: str) -> str:
-        """Prompt for analyzing candidate's answer."""
-        return f"""Analyze this interview answer for a {job_role} position.
-
-Interview Phase: {phase}
-Question Asked: "{question}"
-Candidate's Answer: "{answer}"
-
-Provide your analysis as a JSON object with these fields:
-- quality_score (1-10): How well-structured and articulate the answer is
-- relevance_score (1-10): How relevant to the question
-- completeness_score (1-10): How complete the answer is
-- technical_depth (1-10): Technical knowledge shown (if applicable)
-- communication_quality (1-10): Clarity and professionalism
-- extracted_info: Object containing skills, technologies, experience_level, communication_style, confidence_indicator, key_points (all as arrays or strings)
-- suggested_follow_ups: Array of potential follow-up questions
-- areas_to_probe: Array of topics to explore further
-- red_flags: Array of concerning aspects (if any)
-- positive_signs: Array of positive indicators
-
-Respond with ONLY the JSON object, no other text."""
+        """
+        Prompt for analyzing candidate's answer.
+        
+        extracted_info doubles as the LLM fact source (see
+        FactExtractor.extract_from_analysis), so one call per answer covers
+        both scoring and fact extraction; extract_facts is not needed on
+        the answer path.
+        """
+        return _ANALYZE_ANSWER_TEMPLATE.substitute(
+            job_role=job_role, phase=phase, question=question, answer=answer
+        )
 
     # ============================================================
     # REPORT GENERATION AGENT PROMPT
@@ -128,24 +286,13 @@ Respond with ONLY the JSON object, no other text."""
         positive_signs: str
     ) -> str:
         """Prompt for generating final interview report."""
-        return f"""Generate a professional interview assessment for a {job_role} candidate.
-
-Candidate Profile:
-{candidate_profile}
-
-Average Scores: {avg_scores}
-Concerns: {red_flags or 'None noted'}
-Positives: {positive_signs or 'Several positive indicators'}
-
-Provide your assessment as a JSON object with:
-- recommendation: "Strong Hire", "Hire", "Maybe", or "No Hire"
-- fit_score: 1-10 overall fit
-- summary: 2-3 sentence assessment
-- strengths: Array of key strengths
-- weaknesses: Array of areas for improvement
-- next_steps: Array of recommended next steps in hiring process
-
-Respond with ONLY the JSON object."""
+        return _REPORT_TEMPLATE.substitute(
+            job_role=job_role,
+            candidate_profile=candidate_profile,
+            avg_scores=avg_scores,
+            red_flags=red_flags or 'None noted',
+            positive_signs=positive_signs or 'Several positive indicators'
+        )
 
     # ============================================================
     # FOLLOW-UP QUESTION PROMPT
@@ -160,15 +307,12 @@ Respond with ONLY the JSON object."""
         area_to_probe: str
     ) -> str:
         """Prompt for generating a follow-up question."""
-        return f"""You are Alex, interviewing for a {job_role} position.
-
-Previous question: "{last_question}"
-Candidate's answer: "{last_answer[:200]}"
-Area to explore further: {area_to_probe}
-
-Your task: Ask ONE follow-up question to get more detail about "{area_to_probe}".
-
-Respond with ONLY your spoken question. Be curious and professional."""
+        return _FOLLOW_UP_TEMPLATE.substitute(
+            job_role=job_role,
+            last_question=last_question,
+            last_answer=last_answer[:200],
+            area_to_probe=area_to_probe
+        )
 
     # ============================================================
     # FACT EXTRACTION PROMPT
@@ -177,18 +321,7 @@ Respond with ONLY your spoken question. Be curious and professional."""
     @staticmethod
     def extract_facts(phase: str, question: str, answer: str) -> str:
         """Prompt for extracting structured facts."""
-        return f"""Extract factual information from this interview answer.
-
-Phase: {phase}
-Question: "{question}"
-Answer: "{answer}"
-
-Return a JSON array of facts. Each fact should have:
-- type: "skill", "technology", "experience", "project", "behavior", or "achievement"
-- content: The fact as a clear statement
-- confidence: "high", "medium", or "low"
-
-Respond with ONLY the JSON array."""
+        return _EXTRACT_FACTS_TEMPLATE.substitute(phase=phase, question=question, answer=answer)
 
     # ============================================================
     # ADAPTIVE QUESTIONING PROMPT  
@@ -203,53 +336,75 @@ Respond with ONLY the JSON array."""
         phase_question_count: int
     ) -> str:
         """Prompt for deciding next questioning approach."""
-        return f"""Decide the next interview action.
-
-Current Phase: {phase}
-Questions in this phase: {phase_question_count}
-Topics covered: {covered_topics}
-Recent scores: {recent_scores}
-
-Return a JSON object with:
-- should_transition_phase: true or false
-- next_topic: topic to explore next
-- difficulty_adjustment: -1, 0, or 1
-- action: "follow_up", "new_topic", or "transition"
-
-Respond with ONLY the JSON object."""
+        return _NEXT_ACTION_TEMPLATE.substitute(
+            phase=phase,
+            phase_question_count=phase_question_count,
+            covered_topics=covered_topics,
+            recent_scores=recent_scores
+        )
 
 
 # ============================================================
 # FALLBACK QUESTIONS (used when API fails)
 # ============================================================
 
-FALLBACK_QUESTIONS = {
-    "greeting": [
-        "Hello! I'm Alex, and I'll be interviewing you today. Could you please introduce yourself and tell me about your background?"
-    ],
-    "introduction": [
+FALLBACK_QUESTIONS = MappingProxyType({
+    "greeting": (
+        "Hello! I'm Alex, and I'll be interviewing you today. Could you please introduce yourself and tell me about your background?",
+    ),
+    "introduction": (
         "What aspects of your previous experience are most relevant to this role?",
         "Can you walk me through a project you're particularly proud of?",
         "What are you looking for in your next position?"
-    ],
-    "technical": {
-        1: ["Can you explain a programming concept you use frequently in your work?"],
-        2: ["How would you approach debugging an issue in production?"],
-        3: ["Describe a technical decision you made and the trade-offs involved."],
-        4: ["How do you ensure code quality and maintainability in your projects?"],
-        5: ["Describe the most complex system you've designed or significantly contributed to."]
-    },
-    "behavioral": [
+    ),
+    "technical": MappingProxyType({
+        1: ("Can you explain a programming concept you use frequently in your work?",),
+        2: ("How would you approach debugging an issue in production?",),
+        3: ("Describe a technical decision you made and the trade-offs involved.",),
+        4: ("How do you ensure code quality and maintainability in your projects?",),
+        5: ("Describe the most complex system you've designed or significantly contributed to.",)
+    }),
+    "behavioral": (
         "Tell me about a time you faced a significant challenge at work. How did you handle it?",
         "Describe a situation where you had to work with a difficult team member.",
         "Tell me about a time when you received critical feedback. How did you respond?"
-    ],
-    "situational": [
+    ),
+    "situational": (
         "What would you do if you discovered a critical bug right before a major release?",
         "How would you handle a situation where you had multiple urgent tasks with competing deadlines?",
         "What would you do if a teammate was struggling and falling behind on their work?"
-    ],
-    "closing": [
-        "Thank you so much for your time today. Do you have any questions for me about the role or our team?"
-    ]
+    ),
+    "closing": (
+        "Thank you so much for your time today. Do you have any questions for me about the role or our team?",
+    ),
+})
+
+
+# Round-robin cursors over the fallbacks, so repeated fallbacks don't repeat a question
+_FALLBACK_CYCLES = {
+    phase: itertools.cycle(questions)
+    for phase, questions in FALLBACK_QUESTIONS.items()
+    if isinstance(questions, tuple)
+}
+_TECHNICAL_FALLBACK_CYCLES = {
+    level: itertools.cycle(questions)
+    for level, questions in FALLBACK_QUESTIONS["technical"].items()
 }
+
+
+def get_fallback(phase: str, difficulty_level: Optional[int] = None) -> str:
+    """
+    Next fallback question for a phase.
+    
+    Args:
+        phase: Phase value (e.g. "technical")
+        difficulty_level: 1-5, only used for technical questions
+        
+    Returns:
+        A fallback question
+    """
+    if phase == "technical":
+        cycle = _TECHNICAL_FALLBACK_CYCLES.get(difficulty_level) or _TECHNICAL_FALLBACK_CYCLES[3]
+        return next(cycle)
+    cycle = _FALLBACK_CYCLES.get(phase)
+    return next(cycle) if cycle else "Could you tell me more about that?"
@@ -12,14 +12,24 @@ Compatible with DeepSeek / llama.cpp REST API.
 """
 import sys
 import os
-import tempfile
+import json
+import asyncio
+import logging
+import functools
+import threading
+from contextlib import AsyncExitStack
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+# Configure logging once here; the library modules only create loggers
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -31,9 +41,12 @@ from models.schemas import (
     AnswerAnalysis,
 )
 from interview.state import InterviewStateMachine
+from interview.sessions import SessionStore
 from interview.agents import agent_controller
 from interview.scoring import AnswerScorer
 from memory.vector_db import memory_store
+from llm.client import llm_client
+from llm.prompts import get_fallback
 
 # ================================================================
 # FastAPI App Initialization
@@ -53,59 +66,148 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    """Release the LLM client's pooled connections."""
+    await llm_client.aclose()
+
 # ================================================================
 # Whisper Model (GPU STT)
 # ================================================================
 
-# Lazy loading of Whisper model to avoid startup delay
-_whisper_model = None
+# lru_cache alone can run the loader twice when two threads miss at once
+# (e.g. the startup preload and a first request), so loads are serialized
+_whisper_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_whisper_model():
+    """Load the Whisper model wrapped in a batched inference pipeline."""
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    model = WhisperModel(
+        config.whisper.model_path,
+        device=config.whisper.device,
+        compute_type=config.whisper.compute_type
+    )
+    return BatchedInferencePipeline(model=model)
+
 
 def get_whisper_model():
-    """Lazy load the Whisper model."""
-    global _whisper_model
-    if _whisper_model is None:
-        from faster_whisper import WhisperModel
-        _whisper_model = WhisperModel(
-            config.whisper.model_path,
-            device=config.whisper.device,
-            compute_type=config.whisper.compute_type
-        )
-    return _whisper_model
+    """The shared Whisper pipeline, loaded exactly once per process."""
+    with _whisper_lock:
+        return _load_whisper_model()
+
+
+def warm_up_whisper():
+    """
+    Load Whisper and run one pass over a second of silence.
+    
+    CUDA kernels, cuBLAS plans and memory pools are initialized here rather
+    than on the candidate's first answer. Each uvicorn worker holds its own
+    copy of the model, so run a single worker per GPU.
+    """
+    import numpy as np
+    
+    whisper = get_whisper_model()
+    segments, _ = whisper.transcribe(
+        np.zeros(16000, dtype=np.float32),
+        batch_size=config.whisper.batch_size,
+        without_timestamps=True,
+        beam_size=1,
+        temperature=0.0
+    )
+    # Segments are decoded lazily; consume them so the pass actually runs
+    for _ in segments:
+        pass
+
+
+@app.on_event("startup")
+async def preload_whisper():
+    """Load and warm the Whisper model before serving requests."""
+    if not config.whisper.preload:
+        return
+    try:
+        await asyncio.to_thread(warm_up_whisper)
+        logger.info("Whisper model loaded and warmed up")
+    except Exception as e:
+        # STT stays lazy; the first audio request will retry the load
+        logger.warning("Whisper preload failed: %s", e)
 
 # ================================================================
 # Session Management
 # ================================================================
 
-# Global interview state (single session for now)
-# In production, use Redis or database for multi-session support
-_current_session: Optional[InterviewStateMachine] = None
+# Sessions are keyed by session_id; Redis-backed when REDIS_URL is set so
+# every worker sees the same interviews
+session_store = SessionStore(
+    redis_url=config.interview.redis_url,
+    ttl_seconds=config.interview.session_ttl_seconds
+)
+
+# Every endpoint but /start-interview acts on the session_id it returned, sent
+# as the X-Session-ID header like the frontend does (or as a query parameter)
+_SESSION_ID_DOC = "Interview session ID returned by /start-interview"
+
 
+@app.on_event("shutdown")
+async def close_session_store():
+    """Release the session store's connections."""
+    await session_store.close()
 
-def get_current_session() -> InterviewStateMachine:
-    """Get the current interview session."""
-    global _current_session
-    if _current_session is None:
+
+def request_session_id(
+    header_id: Optional[str] = Header(None, alias="X-Session-ID", description=_SESSION_ID_DOC),
+    query_id: Optional[str] = Query(None, alias="session_id", description=_SESSION_ID_DOC)
+) -> str:
+    """Dependency resolving the caller's session ID, header first."""
+    session_id = header_id or query_id
+    if not session_id:
         raise HTTPException(
-            status_code=400,
-            detail="No active interview session. Please start an interview first."
+            status_code=422,
+            detail="Missing session ID: send the X-Session-ID header returned by /start-interview."
+        )
+    return session_id
+
+
+async def get_current_session(session_id: str) -> InterviewStateMachine:
+    """Get an interview session by ID."""
+    session = await session_store.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Interview session not found or expired. Please start an interview first."
         )
-    return _current_session
+    return session
+
+
+async def hold_session(session_id: str, stack: AsyncExitStack) -> InterviewStateMachine:
+    """Lock a session until stack closes, then load it."""
+    try:
+        await stack.enter_async_context(session_store.lock(session_id))
+    except TimeoutError:
+        raise HTTPException(
+            status_code=409,
+            detail="Another request for this interview is still being processed."
+        )
+    return await get_current_session(session_id)
+
+
+async def locked_session(session_id: str = Depends(request_session_id)):
+    """Dependency yielding the caller's session; overlapping requests for it wait their turn."""
+    async with AsyncExitStack() as stack:
+        yield await hold_session(session_id, stack)
 
 
 def create_new_session(job_role: str) -> InterviewStateMachine:
-    """Create a new interview session."""
-    global _current_session
-    _current_session = InterviewStateMachine(job_role=job_role)
-    return _current_session
+    """Create a new interview session (stored once its greeting is recorded)."""
+    return InterviewStateMachine(job_role=job_role)
 
 
-def clear_session():
-    """Clear the current session."""
-    global _current_session
-    if _current_session:
-        # Clear memory for this session
-        memory_store.clear_session(_current_session.session_id)
-    _current_session = None
+async def clear_session(session: InterviewStateMachine):
+    """Clear a session and its stored memories."""
+    await asyncio.to_thread(memory_store.clear_session, session.session_id)
+    await session_store.delete(session.session_id)
 
 
 # ================================================================
@@ -141,7 +243,7 @@ async def start_interview(request: StartInterviewRequest):
         session.focus_areas = request.focus_areas
     
     # Generate initial greeting
-    greeting = agent_controller.generate_next_question(
+    greeting = await agent_controller.agenerate_next_question(
         session_id=session.session_id,
         phase=session.phase,
         job_role=session.job_role,
@@ -153,6 +255,7 @@ async def start_interview(request: StartInterviewRequest):
     
     # Record the greeting as first question
     session.add_question(greeting, topic="introduction")
+    await session_store.create(session)
     
     return {
         "status": "Interview started",
@@ -165,7 +268,10 @@ async def start_interview(request: StartInterviewRequest):
 
 
 @app.post("/interview-response")
-async def interview_response(file: UploadFile = File(...)):
+async def interview_response(
+    file: UploadFile = File(...),
+    session: InterviewStateMachine = Depends(locked_session)
+):
     """
     Process candidate's voice response during interview.
     
@@ -175,7 +281,6 @@ async def interview_response(file: UploadFile = File(...)):
     Returns:
         Transcript, analysis, and next question
     """
-    session = get_current_session()
     
     if session.phase == InterviewPhase.ENDED:
         return {
@@ -194,21 +299,26 @@ async def interview_response(file: UploadFile = File(...)):
     
     # Transcribe audio
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            content = await file.read()
-            tmp.write(content)
-            audio_path = tmp.name
+        from faster_whisper import decode_audio
+        
+        # Decode directly from the spooled upload instead of buffering it
+        # into bytes or round-tripping through a temp file
+        await file.seek(0)
+        audio = decode_audio(file.file, sampling_rate=16000)
         
         whisper = get_whisper_model()
-        segments, _ = whisper.transcribe(audio_path)
+        segments, _ = whisper.transcribe(
+            audio,
+            batch_size=config.whisper.batch_size,
+            vad_filter=True,
+            without_timestamps=True,
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            condition_on_previous_text=False
+        )
         user_text = " ".join([s.text for s in segments]).strip()
         
-        # Clean up temp file
-        try:
-            os.unlink(audio_path)
-        except:
-            pass
-        
         if not user_text or len(user_text.split()) < 2:
             return {
                 "interviewer_message": "I didn't catch that. Could you please repeat your answer?",
@@ -235,7 +345,10 @@ class TextResponseRequest(BaseModel):
 
 
 @app.post("/text-response")
-async def text_response(request: TextResponseRequest):
+async def text_response(
+    request: TextResponseRequest,
+    session: InterviewStateMachine = Depends(locked_session)
+):
     """
     Process text response from candidate (alternative to voice).
     
@@ -245,7 +358,6 @@ async def text_response(request: TextResponseRequest):
     Returns:
         Analysis and next question
     """
-    session = get_current_session()
     
     if session.phase == InterviewPhase.ENDED:
         return {
@@ -278,11 +390,44 @@ async def _process_text_response(
     Returns:
         Response dictionary with analysis and next question
     """
+    analysis, fact_ids, ended = await _record_answer(session, user_text)
+    if ended is not None:
+        await session_store.save(session)
+        return ended
+    
+    # Generate next question with RAG context
+    next_question = await agent_controller.agenerate_next_question(
+        session_id=session.session_id,
+        phase=session.phase,
+        job_role=session.job_role,
+        candidate_profile=session.candidate_profile,
+        covered_topics=session.covered_topics,
+        difficulty_level=session.difficulty_level,
+        recent_context=session.get_context_string(3)
+    )
+    
+    # Record the question
+    session.add_question(next_question)
+    await session_store.save(session)
+    
+    return _turn_response(session, user_text, analysis, fact_ids, next_question)
+
+
+async def _record_answer(
+    session: InterviewStateMachine,
+    user_text: str
+) -> Tuple[AnswerAnalysis, List[str], Optional[Dict[str, Any]]]:
+    """
+    Analyze and record an answer, moving to the next phase if due.
+    
+    Returns:
+        (analysis, stored fact IDs, final response if the interview just ended)
+    """
     # Get the last question
     last_question = session.get_last_question() or ""
     
     # Process answer through agents (analyze + extract facts + store in vector DB)
-    analysis, fact_ids = agent_controller.process_answer(
+    analysis, fact_ids = await agent_controller.process_answer(
         session_id=session.session_id,
         question=last_question,
         answer=user_text,
@@ -301,46 +446,42 @@ async def _process_text_response(
     if session.should_transition_phase():
         if not session.transition_to_next_phase():
             # Interview ended
-            return {
+            return analysis, fact_ids, {
                 "transcript": user_text,
                 "interviewer_message": "Thank you for your time. The interview is now complete. You can request your interview report.",
                 "phase": session.phase.value,
-                "analysis_scores": {
-                    "quality": analysis.quality_score,
-                    "relevance": analysis.relevance_score,
-                    "completeness": analysis.completeness_score,
-                    "technical_depth": analysis.technical_depth,
-                    "communication": analysis.communication_quality
-                },
+                "analysis_scores": _analysis_scores(analysis),
                 "interview_ended": True,
                 "facts_stored": len(fact_ids)
             }
     
-    # Generate next question with RAG context
-    next_question = agent_controller.generate_next_question(
-        session_id=session.session_id,
-        phase=session.phase,
-        job_role=session.job_role,
-        candidate_profile=session.candidate_profile,
-        covered_topics=session.covered_topics,
-        difficulty_level=session.difficulty_level,
-        recent_context=session.get_context_string(3)
-    )
-    
-    # Record the question
-    session.add_question(next_question)
-    
+    return analysis, fact_ids, None
+
+
+def _analysis_scores(analysis: AnswerAnalysis) -> Dict[str, int]:
+    """Per-dimension scores reported back to the client."""
+    return {
+        "quality": analysis.quality_score,
+        "relevance": analysis.relevance_score,
+        "completeness": analysis.completeness_score,
+        "technical_depth": analysis.technical_depth,
+        "communication": analysis.communication_quality
+    }
+
+
+def _turn_response(
+    session: InterviewStateMachine,
+    user_text: str,
+    analysis: AnswerAnalysis,
+    fact_ids: List[str],
+    next_question: str
+) -> Dict[str, Any]:
+    """Response for a turn that continues with next_question."""
     return {
         "transcript": user_text,
         "interviewer_message": next_question,
         "phase": session.phase.value,
-        "analysis_scores": {
-            "quality": analysis.quality_score,
-            "relevance": analysis.relevance_score,
-            "completeness": analysis.completeness_score,
-            "technical_depth": analysis.technical_depth,
-            "communication": analysis.communication_quality
-        },
+        "analysis_scores": _analysis_scores(analysis),
         "candidate_profile_update": {
             "skills": session.candidate_profile.skills[-5:],
             "technologies": session.candidate_profile.technologies[-5:],
@@ -352,28 +493,127 @@ async def _process_text_response(
     }
 
 
+def _sse(event: str, data: Any) -> str:
+    """Format one server-sent event; data is JSON so newlines survive."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/text-response/stream")
+async def text_response_stream(
+    request: TextResponseRequest,
+    session_id: str = Depends(request_session_id)
+):
+    """
+    Streaming variant of /text-response.
+    
+    The answer is analyzed first, then the next question is sent as
+    server-sent events while the LLM decodes it, so the client can show
+    (or start speaking) the first words straight away:
+    - "token": a piece of the question text
+    - "done": the same body /text-response returns, once the question is complete;
+      its interviewer_message is the question as recorded, which replaces the
+      streamed text if the LLM failed part-way through
+    
+    Args:
+        request: Contains user_text - the candidate's text response
+    """
+    # The session stays locked until the question has streamed and been
+    # recorded, so the stack is closed by the event generator, not here
+    stack = AsyncExitStack()
+    streaming = False
+    try:
+        session = await hold_session(session_id, stack)
+        
+        if session.phase == InterviewPhase.ENDED:
+            return {
+                "error": "Interview has ended",
+                "interviewer_message": "The interview is complete. Thank you.",
+                "interview_ended": True
+            }
+        
+        if not request.user_text or len(request.user_text.strip()) < 2:
+            return {
+                "error": "Please provide a response",
+                "interviewer_message": "I didn't catch that. Could you please try again?",
+                "interview_ended": False
+            }
+        
+        user_text = request.user_text.strip()
+        analysis, fact_ids, ended = await _record_answer(session, user_text)
+        # Persist the answer now; the question is saved once it has streamed
+        await session_store.save(session)
+        
+        async def events():
+            pieces = []
+            recorded = ended is not None
+            try:
+                if ended is not None:
+                    yield _sse("done", ended)
+                    return
+                
+                try:
+                    async for piece in agent_controller.astream_next_question(
+                        session_id=session.session_id,
+                        phase=session.phase,
+                        job_role=session.job_role,
+                        candidate_profile=session.candidate_profile,
+                        covered_topics=session.covered_topics,
+                        difficulty_level=session.difficulty_level,
+                        recent_context=session.get_context_string(3)
+                    ):
+                        pieces.append(piece)
+                        yield _sse("token", piece)
+                    next_question = "".join(pieces).strip()
+                except Exception as e:
+                    logger.warning("Question stream failed part-way (%s), using fallback", e)
+                    next_question = get_fallback(session.phase.value, session.difficulty_level)
+                
+                session.add_question(next_question)
+                recorded = True
+                await session_store.save(session)
+                yield _sse("done", _turn_response(session, user_text, analysis, fact_ids, next_question))
+            finally:
+                try:
+                    if not recorded:
+                        # The client went away mid-stream; record what it was sent so
+                        # the next answer is analyzed against the right question
+                        session.add_question(
+                            "".join(pieces).strip()
+                            or get_fallback(session.phase.value, session.difficulty_level)
+                        )
+                        await session_store.save(session)
+                finally:
+                    await stack.aclose()
+        
+        streaming = True
+        return StreamingResponse(events(), media_type="text/event-stream")
+    finally:
+        if not streaming:
+            await stack.aclose()
+
+
 @app.get("/interview-status")
-async def get_interview_status():
+async def get_interview_status(session_id: str = Depends(request_session_id)):
     """
     Get current interview status and candidate profile.
     
     Returns:
         Current phase, progress, and candidate info
     """
-    session = get_current_session()
+    session = await get_current_session(session_id)
     return session.get_status()
 
 
 @app.post("/end-interview")
-async def end_interview():
+async def end_interview(session: InterviewStateMachine = Depends(locked_session)):
     """
     End the interview early.
     
     Returns:
         Interview summary
     """
-    session = get_current_session()
     session.end_interview()
+    await session_store.save(session)
     
     duration = None
     if session.start_time and session.end_time:
@@ -389,14 +629,14 @@ async def end_interview():
 
 
 @app.get("/interview-report")
-async def get_interview_report():
+async def get_interview_report(session_id: str = Depends(request_session_id)):
     """
     Generate comprehensive interview report.
     
     Returns:
         Full interview report with scores, analysis, and recommendations
     """
-    session = get_current_session()
+    session = await get_current_session(session_id)
     
     if not session.answers_received:
         raise HTTPException(
@@ -420,13 +660,18 @@ async def get_interview_report():
         if phase_analyses:
             phase_scores[phase.value] = AnswerScorer.aggregate_phase_scores(phase_analyses, phase)
     
-    # Generate AI assessment
-    ai_assessment = agent_controller.generate_final_report(
-        job_role=session.job_role,
-        candidate_profile=session.candidate_profile,
-        all_analyses=all_analyses,
-        red_flags=session.red_flags,
-        positive_signs=session.positive_signs
+    # Generate AI assessment and fetch the memory summary concurrently;
+    # they are independent, so the vector DB read hides behind the LLM call
+    ai_assessment, memory_summary = await asyncio.gather(
+        asyncio.to_thread(
+            agent_controller.generate_final_report,
+            job_role=session.job_role,
+            candidate_profile=session.candidate_profile,
+            all_analyses=all_analyses,
+            red_flags=session.red_flags,
+            positive_signs=session.positive_signs
+        ),
+        asyncio.to_thread(memory_store.get_session_summary, session.session_id)
     )
     
     # Calculate duration
@@ -435,9 +680,6 @@ async def get_interview_report():
         end = session.end_time or datetime.now()
         duration_minutes = round((end - session.start_time).total_seconds() / 60, 1)
     
-    # Get memory summary
-    memory_summary = memory_store.get_session_summary(session.session_id)
-    
     # Build skill graph from profile
     skill_graph = {}
     for tech in session.candidate_profile.technologies[:10]:
@@ -491,8 +733,8 @@ async def get_interview_report():
             for i in range(len(session.questions_asked))
         ],
         "observations": {
-            "red_flags": list(set(session.red_flags))[:10],
-            "positive_signs": list(set(session.positive_signs))[:10],
+            "red_flags": session.red_flags[:10],
+            "positive_signs": session.positive_signs[:10],
             "difficulty_progression": session.difficulty_level
         }
     }
@@ -501,19 +743,19 @@ async def get_interview_report():
 
 
 @app.post("/reset-interview")
-async def reset_interview():
+async def reset_interview(session: InterviewStateMachine = Depends(locked_session)):
     """
     Reset interview state and start fresh.
     
     Returns:
         Confirmation message
     """
-    clear_session()
+    await clear_session(session)
     return {"status": "Interview reset successfully"}
 
 
 @app.get("/debug/conversation")
-async def debug_conversation():
+async def debug_conversation(session_id: str = Depends(request_session_id)):
     """
     Debug endpoint to see full conversation history.
     
@@ -521,7 +763,7 @@ async def debug_conversation():
         Full conversation state
     """
     try:
-        session = get_current_session()
+        session = await get_current_session(session_id)
         return {
             "session_id": session.session_id,
             "phase": session.phase.value,
@@ -544,7 +786,7 @@ async def debug_conversation():
 
 
 @app.get("/debug/memory")
-async def debug_memory():
+async def debug_memory(session_id: str = Depends(request_session_id)):
     """
     Debug endpoint to see stored memories.
     
@@ -552,7 +794,7 @@ async def debug_memory():
         Memory store statistics and recent facts
     """
     try:
-        session = get_current_session()
+        session = await get_current_session(session_id)
         summary = memory_store.get_session_summary(session.session_id)
         return {
             "session_id": session.session_id,
@@ -98,7 +98,7 @@ class FactExtractor:
             behavior_facts = self._extract_behaviors(answer, phase)
             facts.extend(behavior_facts)
         
-        logger.info(f"Extracted {len(facts)} facts from answer")
+        logger.info("Extracted %s facts from answer", len(facts))
         return facts
     
     def _extract_technologies(self, answer: str, phase: str) -> List[ExtractedFact]:
@@ -13,6 +13,14 @@ try:
 except ImportError:
     CHROMADB_AVAILABLE = False
 
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+from utils.config import config
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,10 +29,14 @@ class MemoryStore:
     Vector database store for interview memory/facts.
     """
     
+    # Facts per encoder forward pass
+    EMBED_BATCH_SIZE = 32
+    
     def __init__(self):
         self.client = None
         self.collection = None
         self._initialized = False
+        self._embedder = None
         
         if CHROMADB_AVAILABLE:
             try:
@@ -38,10 +50,34 @@ class MemoryStore:
                 self._initialized = True
                 logger.info("ChromaDB initialized successfully")
             except Exception as e:
-                logger.warning(f"ChromaDB initialization failed: {e}")
+                logger.warning("ChromaDB initialization failed: %s", e)
         else:
             logger.warning("ChromaDB not available, memory store disabled")
     
+    def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed texts in batched encoder passes.
+        
+        Returns None when sentence-transformers is unavailable, in which case
+        ChromaDB falls back to its built-in embedding function.
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+        
+        try:
+            if self._embedder is None:
+                self._embedder = SentenceTransformer(config.memory.embedding_model)
+            embeddings = self._embedder.encode(
+                texts,
+                batch_size=self.EMBED_BATCH_SIZE,
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )
+            return embeddings.tolist()
+        except Exception as e:
+            logger.warning("Embedding failed, using ChromaDB default: %s", e)
+            return None
+    
     def store_facts(
         self,
         session_id: str,
@@ -66,9 +102,12 @@ class MemoryStore:
             ids = []
             documents = []
             metadatas = []
+            now = datetime.now()
+            now_ts = now.timestamp()
+            now_iso = now.isoformat()
             
             for i, fact in enumerate(facts):
-                fact_id = f"{session_id}_{phase}_{datetime.now().timestamp()}_{i}"
+                fact_id = f"{session_id}_{phase}_{now_ts}_{i}"
                 ids.append(fact_id)
                 
                 # Create document text for embedding
@@ -80,20 +119,30 @@ class MemoryStore:
                     "session_id": session_id,
                     "phase": phase,
                     "fact_type": fact.get('type', 'general'),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
             
-            self.collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas
-            )
+            # One batched encoder call for every fact in the answer
+            embeddings = self._embed(documents)
+            if embeddings is not None:
+                self.collection.add(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                    embeddings=embeddings
+                )
+            else:
+                self.collection.add(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas
+                )
             
-            logger.info(f"Stored {len(ids)} facts for session {session_id}")
+            logger.info("Stored %s facts for session %s", len(ids), session_id)
             return ids
             
         except Exception as e:
-            logger.error(f"Failed to store facts: {e}")
+            logger.error("Failed to store facts: %s", e)
             return []
     
     def retrieve_relevant(
@@ -123,11 +172,20 @@ class MemoryStore:
             if phase_filter:
                 where_filter["phase"] = phase_filter
             
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results,
-                where=where_filter
-            )
+            # Query in the same embedding space the facts were stored in
+            query_embeddings = self._embed([query])
+            if query_embeddings is not None:
+                results = self.collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    where=where_filter
+                )
+            else:
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=n_results,
+                    where=where_filter
+                )
             
             facts = []
             if results and results['documents']:
@@ -140,7 +198,7 @@ class MemoryStore:
             return facts
             
         except Exception as e:
-            logger.error(f"Failed to retrieve facts: {e}")
+            logger.error("Failed to retrieve facts: %s", e)
             return []
     
     def clear_session(self, session_id: str) -> bool:
@@ -165,12 +223,12 @@ class MemoryStore:
             
             if results and results['ids']:
                 self.collection.delete(ids=results['ids'])
-                logger.info(f"Cleared {len(results['ids'])} facts for session {session_id}")
+                logger.info("Cleared %s facts for session %s", len(results['ids']), session_id)
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to clear session: {e}")
+            logger.error("Failed to clear session: %s", e)
             return False
     
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
@@ -225,7 +283,7 @@ class MemoryStore:
             return summary
             
         except Exception as e:
-            logger.error(f"Failed to get session summary: {e}")
+            logger.error("Failed to get session summary: %s", e)
             return {"total_facts": 0, "skills": [], "technologies": []}
     
     def get_collection_stats(self) -> Dict[str, Any]:
@@ -246,7 +304,7 @@ class MemoryStore:
                 "name": "interview_facts"
             }
         except Exception as e:
-            logger.error(f"Failed to get collection stats: {e}")
+            logger.error("Failed to get collection stats: %s", e)
             return {"initialized": True, "count": 0, "error": str(e)}
 
 
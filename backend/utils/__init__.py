@@ -1,3 +1,4 @@
 # Utils module
 from .config import Config
 from .cleaning import ResponseCleaner
+from .locks import KeyedLocks
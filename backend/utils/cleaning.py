@@ -6,7 +6,16 @@ This module is specifically tuned for DeepSeek-R1-Distill models that
 include extensive <think> reasoning blocks before actual responses.
 """
 import re
-from typing import Optional, Tuple
+import json
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_JSON_DECODER = json.JSONDecoder()
 
 
 class ResponseCleaner:
@@ -168,18 +177,91 @@ class ResponseCleaner:
         
         return cleaned, True
     
+    @staticmethod
+    def extract_json_object(text: str) -> Optional[str]:
+        """
+        Find the first balanced JSON object in an LLM response.
+        
+        Single pass tracking brace depth and string/escape state, so braces
+        inside string values, surrounding prose and code fences are handled
+        without a regex scan.
+        
+        Args:
+            text: Raw LLM output
+            
+        Returns:
+            The object's source text, or None if there is no complete object
+        """
+        start = text.find('{')
+        if start == -1:
+            return None
+        
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        
+        return None
+    
+    @staticmethod
+    def decode_json(text: str, openers: str = "{[") -> Optional[Any]:
+        """
+        Decode the first JSON value embedded in an LLM response.
+        
+        Schema-constrained output is bare JSON, so that is tried first with
+        orjson. Otherwise (prose, code fences) the C-accelerated raw_decode
+        is tried at each candidate opening bracket, so nesting of any depth
+        is handled and the value is parsed only once.
+        
+        Args:
+            text: Raw LLM output
+            openers: Characters a value may start with ('{' objects, '[' arrays)
+            
+        Returns:
+            The decoded value, or None if no valid JSON value is found
+        """
+        stripped = text.strip()
+        if ORJSON_AVAILABLE and stripped[:1] in openers:
+            try:
+                return orjson.loads(stripped)
+            except orjson.JSONDecodeError:
+                pass
+        
+        idx = 0
+        n = len(text)
+        while idx < n:
+            # Next candidate start among the allowed openers
+            positions = [p for p in (text.find(ch, idx) for ch in openers) if p != -1]
+            if not positions:
+                return None
+            idx = min(positions)
+            try:
+                value, _ = _JSON_DECODER.raw_decode(text, idx)
+                return value
+            except json.JSONDecodeError:
+                idx += 1
+        return None
+    
     @classmethod
     def clean_json_response(cls, text: str) -> str:
         """Clean response and extract JSON content."""
-        # Remove ALL content before the first {
-        cleaned = re.sub(r'^.*?(?=\{)', '', text, flags=re.DOTALL)
-        
-        # Find JSON object
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', cleaned, re.DOTALL)
-        if json_match:
-            return json_match.group()
-        
-        return "{}"
+        return cls.extract_json_object(text) or "{}"
     
     @classmethod
     def clean_analysis_response(cls, text: str) -> str:
@@ -11,10 +11,20 @@ from dataclasses import dataclass, field
 @dataclass
 class LLMConfig:
     """LLM server configuration."""
+    # "openrouter" (hosted API) or "llamacpp" (local server at base_url)
+    backend: str = field(default_factory=lambda: os.getenv("LLM_BACKEND", "openrouter").lower())
     base_url: str = field(default_factory=lambda: os.getenv("LLM_URL", "http://localhost:9000"))
     completion_endpoint: str = "/completion"
     timeout: int = 60  # Increased for DeepSeek R1 thinking time
     max_retries: int = 3
+    # Use an HTTP/2 client for the hosted API (needs httpx[http2])
+    http2: bool = field(default_factory=lambda: os.getenv("LLM_HTTP2", "0") == "1")
+    # Open the connection in the background at startup so the first turn skips the handshake
+    warmup: bool = field(default_factory=lambda: os.getenv("LLM_WARMUP", "1") == "1")
+    # Async LLM requests in flight per client; more wait rather than overload the server
+    max_concurrency: int = field(default_factory=lambda: int(os.getenv("LLM_MAX_CONCURRENCY", "32")))
+    # Directory for the on-disk response cache (needs diskcache); empty keeps it in memory only
+    cache_dir: str = field(default_factory=lambda: os.getenv("LLM_CACHE_DIR", ""))
     
     # Default generation parameters
     default_temperature: float = 0.7
@@ -31,7 +41,10 @@ class WhisperConfig:
     """Whisper STT configuration."""
     model_path: str = field(default_factory=lambda: os.getenv("WHISPER_MODEL_PATH", "../models/medium"))
     device: str = "cuda"
-    compute_type: str = "float16"
+    compute_type: str = field(default_factory=lambda: os.getenv("WHISPER_COMPUTE_TYPE", "int8_float16"))
+    batch_size: int = 8  # VAD chunks decoded per GPU batch; leave VRAM for the LLM
+    # Load and warm the model at startup instead of on the first answer
+    preload: bool = field(default_factory=lambda: os.getenv("WHISPER_PRELOAD", "1") == "1")
 
 
 @dataclass
@@ -63,6 +76,10 @@ class InterviewConfig:
     """Interview flow configuration."""
     default_job_role: str = "Software Engineer"
     
+    # Session storage: Redis when set (shared by all workers), else in-process
+    redis_url: str = field(default_factory=lambda: os.getenv("REDIS_URL", ""))
+    session_ttl_seconds: int = field(default_factory=lambda: int(os.getenv("SESSION_TTL_SECONDS", "86400")))
+    
     # Phase configurations
     phases: Dict[str, PhaseConfig] = field(default_factory=lambda: {
         "greeting": PhaseConfig(min_questions=1, max_questions=2, time_limit_minutes=2),
@@ -0,0 +1,25 @@
+"""
+Per-key asyncio locks for serializing requests on one interview session.
+"""
+import asyncio
+import weakref
+
+
+class KeyedLocks:
+    """
+    One asyncio.Lock per key, created on first use.
+    
+    Locks are held weakly, so a key's lock disappears once no request holds
+    or waits on it and idle sessions don't accumulate locks.
+    """
+    
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    
+    def get(self, key: str) -> asyncio.Lock:
+        """Return the lock for key, creating it if nobody holds one."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock